@@ -1,8 +1,25 @@
+from typing_extensions import TypedDict
 from pydantic import BaseModel
 from pydantic_ai import Agent
 from pydantic_ai.models.openai import OpenAIChatModel
+from pydantic_ai.providers.openai import OpenAIProvider
 from netmind_config import get_netmind_config, get_netmind_model
-import os
+
+# Chat models by API key; agents are built without a model and each run passes the model for its key
+_chat_models: dict = {}
+
+def netmind_chat_model(api_key=None):
+    """
+    Get the chat model that talks to NetMind through the shared AsyncOpenAI client for api_key
+    """
+    api_key = api_key or get_netmind_config().api_key
+    model = _chat_models.get(api_key)
+    if model is None:
+        model = _chat_models[api_key] = OpenAIChatModel(
+            get_netmind_config().get_model_name(),
+            provider=OpenAIProvider(openai_client=get_netmind_model(api_key))
+        )
+    return model
 
 ARCHITECTURE_AGENT_INSTRUCTIONS = ("""
 You are the Architecture agent for a self-guided audio tour system. Given a location and the areas of interest of user, your role is to:
@@ -30,13 +47,8 @@ architecture_agent = None
 def get_architecture_agent():
     global architecture_agent
     if architecture_agent is None:
-        # Create OpenAI-compatible model for NetMind API
-        # Set environment variables for custom OpenAI endpoint
-        os.environ['OPENAI_BASE_URL'] = 'https://api.netmind.ai/inference-api/openai/v1'
-        os.environ['OPENAI_API_KEY'] = os.getenv('NETMIND_API_KEY') or ''
-        netmind_model = OpenAIChatModel('openai/gpt-oss-20b')
         architecture_agent = Agent(
-            model=netmind_model,
+            # No model: runs pass the NetMind model for their API key, see netmind_chat_model
             system_prompt=ARCHITECTURE_AGENT_INSTRUCTIONS,
             output_type=Architecture
         )
@@ -69,13 +81,8 @@ culinary_agent = None
 def get_culinary_agent():
     global culinary_agent
     if culinary_agent is None:
-        # Create OpenAI-compatible model for NetMind API
-        # Set environment variables for custom OpenAI endpoint
-        os.environ['OPENAI_BASE_URL'] = 'https://api.netmind.ai/inference-api/openai/v1'
-        os.environ['OPENAI_API_KEY'] = os.getenv('NETMIND_API_KEY') or ''
-        netmind_model = OpenAIChatModel('openai/gpt-oss-20b')
         culinary_agent = Agent(
-            model=netmind_model,
+            # No model: runs pass the NetMind model for their API key, see netmind_chat_model
             system_prompt=CULINARY_AGENT_INSTRUCTIONS,
             output_type=Culinary
         )
@@ -107,13 +114,8 @@ culture_agent = None
 def get_culture_agent():
     global culture_agent
     if culture_agent is None:
-        # Create OpenAI-compatible model for NetMind API
-        # Set environment variables for custom OpenAI endpoint
-        os.environ['OPENAI_BASE_URL'] = 'https://api.netmind.ai/inference-api/openai/v1'
-        os.environ['OPENAI_API_KEY'] = os.getenv('NETMIND_API_KEY') or ''
-        netmind_model = OpenAIChatModel('openai/gpt-oss-20b')
         culture_agent = Agent(
-            model=netmind_model,
+            # No model: runs pass the NetMind model for their API key, see netmind_chat_model
             system_prompt=CULTURE_AGENT_INSTRUCTIONS,
             output_type=Culture
         )
@@ -145,13 +147,8 @@ historical_agent = None
 def get_historical_agent():
     global historical_agent
     if historical_agent is None:
-        # Create OpenAI-compatible model for NetMind API
-        # Set environment variables for custom OpenAI endpoint
-        os.environ['OPENAI_BASE_URL'] = 'https://api.netmind.ai/inference-api/openai/v1'
-        os.environ['OPENAI_API_KEY'] = os.getenv('NETMIND_API_KEY') or ''
-        netmind_model = OpenAIChatModel('openai/gpt-oss-20b')
         historical_agent = Agent(
-            model=netmind_model,
+            # No model: runs pass the NetMind model for their API key, see netmind_chat_model
             system_prompt=HISTORY_AGENT_INSTRUCTIONS,
             output_type=History
         )
@@ -232,24 +229,43 @@ class FinalTour(BaseModel):
     """A short conclusion of the Tour."""
 
 
+class FinalTourSections(TypedDict, total=False):
+    """FinalTour as a partial TypedDict, so sections can be read while the response is still streaming."""
+    introduction: str
+    architecture: str
+    history: str
+    culture: str
+    culinary: str
+    conclusion: str
+
+
 # Orchestrator agent will be initialized when needed
 orchestrator_agent = None
 
 def get_orchestrator_agent():
     global orchestrator_agent
     if orchestrator_agent is None:
-        # Create OpenAI-compatible model for NetMind API
-        # Set environment variables for custom OpenAI endpoint
-        os.environ['OPENAI_BASE_URL'] = 'https://api.netmind.ai/inference-api/openai/v1'
-        os.environ['OPENAI_API_KEY'] = os.getenv('NETMIND_API_KEY') or ''
-        netmind_model = OpenAIChatModel('openai/gpt-oss-20b')
         orchestrator_agent = Agent(
-            model=netmind_model,
+            # No model: runs pass the NetMind model for their API key, see netmind_chat_model
             system_prompt=ORCHESTRATOR_INSTRUCTIONS,
             output_type=FinalTour
         )
     return orchestrator_agent
 
+# Streaming orchestrator agent will be initialized when needed
+orchestrator_stream_agent = None
+
+def get_orchestrator_stream_agent():
+    global orchestrator_stream_agent
+    if orchestrator_stream_agent is None:
+        # Partial validation needs a total=False TypedDict rather than a BaseModel
+        orchestrator_stream_agent = Agent(
+            # No model: runs pass the NetMind model for their API key, see netmind_chat_model
+            system_prompt=ORCHESTRATOR_INSTRUCTIONS,
+            output_type=FinalTourSections
+        )
+    return orchestrator_stream_agent
+
 PLANNER_INSTRUCTIONS = ("""
 
 Your Role
@@ -353,13 +369,8 @@ planner_agent = None
 def get_planner_agent():
     global planner_agent
     if planner_agent is None:
-        # Create OpenAI-compatible model for NetMind API
-        # Set environment variables for custom OpenAI endpoint
-        os.environ['OPENAI_BASE_URL'] = 'https://api.netmind.ai/inference-api/openai/v1'
-        os.environ['OPENAI_API_KEY'] = os.getenv('NETMIND_API_KEY') or ''
-        netmind_model = OpenAIChatModel('openai/gpt-oss-20b')
         planner_agent = Agent(
-            model=netmind_model,
+            # No model: runs pass the NetMind model for their API key, see netmind_chat_model
             system_prompt=PLANNER_INSTRUCTIONS,
             output_type=Planner
         )
@@ -1,42 +1,220 @@
 import streamlit as st
 import asyncio
+import concurrent.futures
+import hashlib
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
 from manager import TourManager
-from netmind_config import setup_netmind_api, get_netmind_config, create_tts_audio, get_netmind_model
+from netmind_config import setup_netmind_api, get_netmind_config, create_tts_audio_parallel, create_tts_audio_stream, get_netmind_model, get_netmind_tts_model
+from netmind_config import curate_cache_dir
+from netmind_config import TTSConnectionError, TTSTimeoutError, TTSAPIError, TTSQuotaError, TTSError
 import json
 
+# uvloop has no Windows build, where the stdlib event loop is used instead
+if sys.platform != "win32":
+    import uvloop
+else:
+    uvloop = None
+
+# Synthesized tours are kept on disk so repeated requests skip the TTS round-trip
+AUDIO_CACHE_DIR = os.path.join(tempfile.gettempdir(), "tts_cache")
+AUDIO_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# TTS voice for each guide voice style, keyed by the style's lowercased first word
+VOICE_MAP = {
+    "friendly": "alloy",
+    "professional": "nova",
+    "enthusiastic": "shimmer"
+}
+
+# Progress stages with emojis, keyed by lowercased message fragment
+PROGRESS_STAGE_EMOJIS = {
+    "tts attempt": "🔄",
+    "calling tts api": "📡",
+    "downloading audio": "⬇️",
+    "synthesized segment": "🔊",
+    "audio generation completed": "✅"
+}
+# Minimum seconds between progress redraws; each redraw is a websocket message to the browser
+PROGRESS_UPDATE_INTERVAL = 0.1
+
+def audio_cache_path(text, voice):
+    """
+    Get the cache file path for a tour's audio
+    Key includes voice and model name so changing either invalidates cached audio
+    """
+    text_hash = hashlib.sha256(
+        get_netmind_tts_model().encode() + voice.encode() + text.encode()
+    ).hexdigest()
+    return os.path.join(AUDIO_CACHE_DIR, f"{text_hash}.mp3")
+
+def curate_audio_cache():
+    """
+    Delete the least recently written audio files once the cache exceeds its size budget
+    """
+    curate_cache_dir(AUDIO_CACHE_DIR, AUDIO_CACHE_MAX_BYTES)
+
 def generate_audio(text, voice="alloy", progress_callback=None):
     """
     Generate audio using NetMind TTS
+    Waits for synthesis already started alongside the tour text, otherwise synthesizes the text now
+    TTS failures are raised for the caller to report
     """
     netmind_api_key = st.session_state.get("NETMIND_API_KEY")
-    if netmind_api_key:
-        try:
-            return create_tts_audio(text, netmind_api_key, progress_callback)
-        except Exception as e:
-            st.error(f"NetMind TTS generation failed: {str(e)}")
-            return None
-    else:
+    if not netmind_api_key:
         st.error("NetMind API key not configured")
         return None
+    
+    audio_path = audio_cache_path(text, voice)
+    job = get_audio_jobs().pop(audio_path, None)
+    if job is not None:
+        future, updates = job
+        return wait_with_progress(future, updates, progress_callback)
+    if not os.path.exists(audio_path):
+        run_async_with_progress(
+            create_tts_audio_parallel, text, netmind_api_key,
+            progress_callback=progress_callback, output_path=audio_path
+        )
+        curate_audio_cache()
+    return audio_path
 
-def run_async(func, *args, **kwargs):
-    """Run async function in Streamlit environment safely"""
-    import concurrent.futures
-    import threading
+def voice_for_style(voice_style):
+    """
+    Select appropriate voice parameter based on voice style
+    """
+    return VOICE_MAP.get(voice_style.split(" ", 1)[0].lower(), "alloy")
+
+@st.cache_resource
+def get_tour_manager(api_key):
+    """
+    Build the tour manager once per API key and reuse it across reruns and sessions
+    """
+    setup_netmind_api(api_key)
+    return TourManager(api_key)
+
+@st.cache_resource
+def get_audio_jobs():
+    """
+    Audio synthesis started alongside tour text, keyed by audio cache path until a render picks it up
+    Each job is a (concurrent future of the audio path, queue of progress updates) pair
+    """
+    return {}
+
+async def generate_tour_with_audio(mgr, location, interests, duration, api_key, voice, progress_callback=None):
+    """
+    Stream the tour text and start synthesizing each section as soon as the orchestrator writes it
+    Returns the tour text as soon as it is complete, together with a future for the audio path,
+    which keeps synthesizing the remaining sections on the shared event loop
+    """
+    sections = []
+    text_done = asyncio.get_running_loop().create_future()
     
-    def run_in_thread():
-        # Create a new event loop in a separate thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    async def _collect_sections():
         try:
-            return loop.run_until_complete(func(*args, **kwargs))
+            async for section in mgr.run_stream(location, interests, duration, concurrency=min(len(interests), 4)):
+                sections.append(section)
+                yield section
+            text_done.set_result("\n\n".join(sections))
+        except Exception as e:
+            text_done.set_exception(e)
+            raise
         finally:
-            loop.close()
+            if not text_done.done():
+                text_done.cancel()
+    
+    async def _synthesize():
+        try:
+            audio_path = await create_tts_audio_stream(_collect_sections(), api_key, progress_callback)
+        except Exception:
+            if not text_done.done():
+                # Synthesis failed before it read any text, so stream the tour without it
+                async for _ in _collect_sections():
+                    pass
+            raise
+        cache_path = audio_cache_path(text_done.result(), voice)
+        os.replace(audio_path, cache_path)
+        curate_audio_cache()
+        return cache_path
+    
+    # Scheduled as a thread-safe future so the script thread can wait on the audio after the text is shown
+    audio_future = asyncio.run_coroutine_threadsafe(_synthesize(), asyncio.get_running_loop())
+    try:
+        final_tour = await text_done
+    except BaseException:
+        audio_future.cancel()
+        raise
+    return final_tour, audio_future
+
+@st.cache_data(ttl=3600, show_spinner=False, max_entries=128)
+def generate_tour_cached(location, interests, duration, _api_key, _voice="alloy"):
+    """
+    Generate the tour text once per (location, interests, duration) and reuse it for an hour
+    Interests must be passed as a sorted tuple so equivalent selections share an entry
+    The audio synthesized alongside it is handed to generate_audio through get_audio_jobs
+    """
+    updates = queue.SimpleQueue()
+    final_tour, audio_future = run_async(
+        generate_tour_with_audio, get_tour_manager(_api_key), location, list(interests), duration, _api_key, _voice,
+        progress_callback=lambda message, progress: updates.put((message, progress))
+    )
+    audio_jobs = get_audio_jobs()
+    # Forget finished jobs nobody rendered, e.g. from sessions that were closed meanwhile
+    for path, (future, _) in list(audio_jobs.items()):
+        if future.done():
+            audio_jobs.pop(path, None)
+    audio_jobs[audio_cache_path(final_tour, _voice)] = (audio_future, updates)
+    return final_tour
+
+@st.cache_resource
+def get_event_loop():
+    """
+    Create a single background event loop shared across reruns and sessions
+    """
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="tour-event-loop", daemon=True).start()
+    return loop
+
+def run_async(func, *args, **kwargs):
+    """Run async function on the shared background event loop and wait for the result"""
+    # Reusing one loop keeps the agents' async HTTP clients (bound to the loop) and their
+    # keep-alive connections valid across reruns instead of paying loop/thread setup per call
+    future = asyncio.run_coroutine_threadsafe(func(*args, **kwargs), get_event_loop())
+    return future.result()
+
+def run_async_with_progress(func, *args, progress_callback=None, **kwargs):
+    """
+    Run async function on the shared event loop, relaying its progress updates to the script thread
+    """
+    if progress_callback is None:
+        return run_async(func, *args, **kwargs)
     
-    # Always use thread executor for Streamlit compatibility
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        future = executor.submit(run_in_thread)
-        return future.result()
+    # Streamlit elements can only be updated from the script thread, so the coroutine
+    # queues its updates and they are applied here while waiting for the result
+    updates = queue.SimpleQueue()
+    future = asyncio.run_coroutine_threadsafe(
+        func(*args, progress_callback=lambda message, progress: updates.put((message, progress)), **kwargs),
+        get_event_loop()
+    )
+    return wait_with_progress(future, updates, progress_callback)
+
+def wait_with_progress(future, updates, progress_callback=None):
+    """
+    Wait for a concurrent future, applying its queued (message, progress) updates on the script thread
+    """
+    while True:
+        concurrent.futures.wait([future], timeout=0.1)
+        while not updates.empty():
+            message, progress = updates.get()
+            if progress_callback:
+                progress_callback(message, progress)
+        if future.done():
+            return future.result()
+
+os.makedirs(AUDIO_CACHE_DIR, exist_ok=True)
 
 # Set page config for a better UI
 st.set_page_config(
@@ -121,8 +299,167 @@ with col2:
         help="Select the personality of your tour guide"
     )
 
+def request_audio():
+    """
+    Synthesize the current tour's audio on the next render
+    """
+    st.session_state["audio_requested"] = True
+
+def show_audio_error(e):
+    """
+    Explain a failed audio synthesis in user-friendly terms based on the exception type
+    """
+    if isinstance(e, TTSConnectionError):
+        st.error("🌐 **Network Connection Issue**")
+        st.info("Unable to connect to the audio generation service. Please check your internet connection and try again.")
+    elif isinstance(e, TTSTimeoutError):
+        st.error("⏱️ **Request Timeout**")
+        st.info("The audio generation is taking longer than expected. This might be due to high server load. Please try again in a few minutes.")
+    elif isinstance(e, TTSQuotaError):
+        st.error("📊 **API Quota Exceeded**")
+        st.info("The daily limit for audio generation has been reached. Please try again tomorrow or contact support for increased limits.")
+    elif isinstance(e, TTSAPIError):
+        st.error("🔧 **Service Temporarily Unavailable**")
+        st.info("The audio generation service is experiencing technical difficulties. Please try again later.")
+    else:
+        st.error("❌ **Audio Generation Failed**")
+        st.info(f"An unexpected error occurred: {str(e)}. Please try again or contact support if the issue persists.")
+    
+    # Always show the fallback message
+    st.success("✅ **Your text tour is ready above!** You can still enjoy the complete written tour content.")
+
+@st.fragment
+def render_tour(final_tour, tour_location, voice):
+    """
+    Render the generated tour text and its audio
+    Runs as a fragment, so interacting with the audio widgets reruns only this section
+    Audio is only synthesized when requested by Generate Tour or a retry; its outcome is kept in
+    session state, so other reruns just redisplay it
+    """
+    # Display the tour content in an expandable section
+    with st.expander("Tour Content", expanded=True):
+        st.markdown(final_tour)
+    
+    if not st.session_state.get("NETMIND_API_KEY"):
+        st.warning("Tip: To generate audio, please configure NetMind API key in the sidebar for voice synthesis functionality.")
+        st.info("You can still view the text tour content above. Voice synthesis uses NetMind's Chatterbox TTS model.")
+        return
+    
+    # Create containers for better layout
+    audio_container = st.container()
+    
+    if st.session_state.pop("audio_requested", False):
+        start_time = time.time()
+        last_update = 0.0
+        progress_container = st.container()
+        
+        with progress_container:
+            st.markdown("### 🎵 Generating Audio Tour")
+            progress_bar = st.progress(0)
+            status_text = st.empty()
+            time_text = st.empty()
+            
+        # Enhanced progress callback with time estimation
+        def update_progress(message, progress):
+            nonlocal last_update
+            progress_val = min(max(progress, 0), 1.0)  # Ensure 0-1 range
+            
+            # Throttle redraws to ~10 Hz; skipped values are superseded by the next update
+            now = time.monotonic()
+            if now - last_update < PROGRESS_UPDATE_INTERVAL and progress_val < 1.0:
+                return
+            last_update = now
+            
+            elapsed_time = time.time() - start_time
+            progress_bar.progress(progress_val)
+            
+            # Dynamic time estimation based on progress
+            if progress_val > 0.1:
+                estimated_total = elapsed_time / progress_val
+                remaining_time = max(0, estimated_total - elapsed_time)
+                time_str = f"⏱️ Estimated remaining: {int(remaining_time//60)}m {int(remaining_time%60)}s"
+            else:
+                time_str = "⏱️ Initializing audio generation..."
+            
+            message_lower = message.lower()
+            emoji = "🎵"
+            for stage, stage_emoji in PROGRESS_STAGE_EMOJIS.items():
+                if stage in message_lower:
+                    emoji = stage_emoji
+                    break
+            
+            status_text.markdown(f"**{emoji} {message}**")
+            time_text.markdown(f"*{time_str}*")
+        
+        try:
+            st.session_state["tour_audio"] = generate_audio(final_tour, voice, update_progress)
+            st.session_state["tour_audio_error"] = None
+        except Exception as e:
+            st.session_state["tour_audio"] = None
+            st.session_state["tour_audio_error"] = e
+        
+        # Graceful cleanup with completion message, shown briefly only after a fresh synthesis
+        if st.session_state["tour_audio"]:
+            progress_bar.progress(1.0)
+            status_text.markdown("**✅ Audio generation completed successfully!**")
+            time_text.markdown("*Ready to play*")
+            time.sleep(1)  # Brief pause to show completion
+        
+        # Clean up progress indicators
+        progress_container.empty()
+    
+    tour_audio = st.session_state.get("tour_audio")
+    audio_error = st.session_state.get("tour_audio_error")
+    # The file may have been evicted from the audio cache since it was synthesized
+    if tour_audio and not os.path.exists(tour_audio):
+        tour_audio = None
+    
+    # Display audio results in the audio container
+    with audio_container:
+        if tour_audio:
+            # Success state with enhanced UI
+            st.markdown("### 🎧 Your Audio Tour is Ready!")
+            
+            # Audio player with custom styling, served from the MP3 file on disk
+            st.audio(tour_audio, format="audio/mp3")
+            
+            # Enhanced download section
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                with open(tour_audio, "rb") as audio_file:
+                    st.download_button(
+                        label="📥 Download Audio Tour",
+                        data=audio_file,
+                        file_name=f"{tour_location.lower().replace(' ', '_')}_tour.mp3",
+                        mime="audio/mp3",
+                        use_container_width=True
+                    )
+            with col2:
+                audio_size_mb = os.path.getsize(tour_audio) / (1024 * 1024)
+                st.metric("File Size", f"{audio_size_mb:.1f} MB")
+            
+            # Success message with model info
+            st.success("🎉 Audio tour generated successfully using NetMind Chatterbox TTS model!")
+            
+            # Usage tips
+            with st.expander("🎵 Audio Tips", expanded=False):
+                st.markdown("""
+                - **Best Experience**: Use headphones for immersive audio
+                - **Playback Speed**: Most browsers allow speed adjustment (0.5x - 2x)
+                - **Download**: Save the audio file for offline listening
+                - **Share**: The downloaded file can be shared with others
+                """)
+        else:
+            if audio_error is not None:
+                show_audio_error(audio_error)
+            else:
+                st.markdown("### 📝 Text Tour Available")
+                st.info("💡 **Tip**: The audio for this tour is not available right now. You can generate it again or enjoy reading the tour content.")
+            st.button("🔄 Retry Audio Generation", on_click=request_audio)
+
 # Generate Tour Button
 if st.button("Generate Tour", type="primary"):
+    voice = voice_for_style(voice_style)
     if not st.session_state.get("NETMIND_API_KEY"):
         st.error("Please enter your NetMind API key in the sidebar first.")
     elif not location:
@@ -131,150 +468,20 @@ if st.button("Generate Tour", type="primary"):
         st.error("Please select at least one interest category.")
     else:
         with st.spinner(f"Creating your personalized tour of {location}..."):
-            mgr = TourManager()
-            final_tour = run_async(
-                mgr.run, location, interests, duration
+            # Audio synthesis overlaps text generation and keeps running once the text is shown;
+            # identical requests return the cached text, which in turn hits the audio cache
+            st.session_state["final_tour"] = generate_tour_cached(
+                location, tuple(sorted(interests)), duration, st.session_state["NETMIND_API_KEY"], voice
             )
+            st.session_state["tour_location"] = location
+            st.session_state["tour_audio"] = None
+            st.session_state["tour_audio_error"] = None
+            request_audio()
 
-            # Display the tour content in an expandable section
-            with st.expander("Tour Content", expanded=True):
-                st.markdown(final_tour)
-            
-            # Enhanced audio generation with better UX
-            if st.session_state.get("NETMIND_API_KEY"):
-                import time
-                start_time = time.time()
-                
-                # Create containers for better layout
-                audio_container = st.container()
-                progress_container = st.container()
-                
-                with progress_container:
-                    st.markdown("### 🎵 Generating Audio Tour")
-                    progress_bar = st.progress(0)
-                    status_text = st.empty()
-                    time_text = st.empty()
-                    
-                # Enhanced progress callback with time estimation
-                def update_progress(message, progress):
-                    elapsed_time = time.time() - start_time
-                    progress_val = min(max(progress, 0), 1.0)  # Ensure 0-1 range
-                    progress_bar.progress(progress_val)
-                    
-                    # Dynamic time estimation based on progress
-                    if progress_val > 0.1:
-                        estimated_total = elapsed_time / progress_val
-                        remaining_time = max(0, estimated_total - elapsed_time)
-                        time_str = f"⏱️ Estimated remaining: {int(remaining_time//60)}m {int(remaining_time%60)}s"
-                    else:
-                        time_str = "⏱️ Initializing audio generation..."
-                    
-                    # Progress stages with emojis
-                    stage_emojis = {
-                        "TTS attempt": "🔄",
-                        "Calling TTS API": "📡",
-                        "Downloading audio": "⬇️",
-                        "Audio generation completed": "✅"
-                    }
-                    
-                    emoji = "🎵"
-                    for stage, stage_emoji in stage_emojis.items():
-                        if stage.lower() in message.lower():
-                            emoji = stage_emoji
-                            break
-                    
-                    status_text.markdown(f"**{emoji} {message}**")
-                    time_text.markdown(f"*{time_str}*")
-                
-                try:
-                    # Select appropriate voice parameter based on voice style
-                    voice_map = {
-                        "friendly": "alloy",
-                        "professional": "nova", 
-                        "enthusiastic": "shimmer"
-                    }
-                    voice_key = voice_style.lower().split()[0]
-                    voice = voice_map.get(voice_key, "alloy")
-                    
-                    tour_audio = generate_audio(final_tour, voice, update_progress)
-                    
-                except Exception as e:
-                    # Import TTS exceptions for specific error handling
-                    from netmind_config import TTSConnectionError, TTSTimeoutError, TTSAPIError, TTSQuotaError, TTSError
-                    
-                    # Provide user-friendly error messages based on exception type
-                    if isinstance(e, TTSConnectionError):
-                        st.error("🌐 **Network Connection Issue**")
-                        st.info("Unable to connect to the audio generation service. Please check your internet connection and try again.")
-                    elif isinstance(e, TTSTimeoutError):
-                        st.error("⏱️ **Request Timeout**")
-                        st.info("The audio generation is taking longer than expected. This might be due to high server load. Please try again in a few minutes.")
-                    elif isinstance(e, TTSQuotaError):
-                        st.error("📊 **API Quota Exceeded**")
-                        st.info("The daily limit for audio generation has been reached. Please try again tomorrow or contact support for increased limits.")
-                    elif isinstance(e, TTSAPIError):
-                        st.error("🔧 **Service Temporarily Unavailable**")
-                        st.info("The audio generation service is experiencing technical difficulties. Please try again later.")
-                    else:
-                        st.error("❌ **Audio Generation Failed**")
-                        st.info(f"An unexpected error occurred: {str(e)}. Please try again or contact support if the issue persists.")
-                    
-                    # Always show the fallback message
-                    st.success("✅ **Your text tour is ready above!** You can still enjoy the complete written tour content.")
-                    tour_audio = None
-                finally:
-                    # Graceful cleanup with completion message
-                    if tour_audio:
-                        progress_bar.progress(1.0)
-                        status_text.markdown("**✅ Audio generation completed successfully!**")
-                        time_text.markdown("*Ready to play*")
-                        time.sleep(1)  # Brief pause to show completion
-                    
-                    # Clean up progress indicators
-                    progress_container.empty()
-                
-                # Display audio results in the audio container
-                with audio_container:
-                    if tour_audio:
-                        # Success state with enhanced UI
-                        st.markdown("### 🎧 Your Audio Tour is Ready!")
-                        
-                        # Audio player with custom styling
-                        st.audio(tour_audio, format="audio/mp3")
-                        
-                        # Enhanced download section
-                        col1, col2 = st.columns([2, 1])
-                        with col1:
-                            st.download_button(
-                                label="📥 Download Audio Tour",
-                                data=tour_audio,
-                                file_name=f"{location.lower().replace(' ', '_')}_tour.mp3",
-                                mime="audio/mp3",
-                                use_container_width=True
-                            )
-                        with col2:
-                            audio_size_mb = len(tour_audio) / (1024 * 1024)
-                            st.metric("File Size", f"{audio_size_mb:.1f} MB")
-                        
-                        # Success message with model info
-                        st.success("🎉 Audio tour generated successfully using NetMind Chatterbox TTS model!")
-                        
-                        # Usage tips
-                        with st.expander("🎵 Audio Tips", expanded=False):
-                            st.markdown("""
-                            - **Best Experience**: Use headphones for immersive audio
-                            - **Playback Speed**: Most browsers allow speed adjustment (0.5x - 2x)
-                            - **Download**: Save the audio file for offline listening
-                            - **Share**: The downloaded file can be shared with others
-                            """)
-                    else:
-                        # Enhanced failure state (only shown if no specific error was displayed)
-                        if 'tour_audio' in locals():
-                            st.markdown("### 📝 Text Tour Available")
-                            st.info("💡 **Tip**: While audio generation wasn't successful this time, your complete text tour is ready above. You can try generating audio again or enjoy reading the tour content.")
-            else:
-                st.warning("Tip: To generate audio, please configure NetMind API key in the sidebar for voice synthesis functionality.")
-                st.info("You can still view the text tour content above. Voice synthesis uses NetMind's Chatterbox TTS model.")
+# The tour and its audio outcome are kept in session state, so later reruns re-render them
+# instead of discarding or regenerating them
+if st.session_state.get("final_tour"):
+    render_tour(st.session_state["final_tour"], st.session_state["tour_location"], voice_for_style(voice_style))
 
 # Footer with NetMind branding
 st.markdown("---")
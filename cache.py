@@ -0,0 +1,84 @@
+import asyncio
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+# Agent responses are reused for an hour, bounded to the most recently used entries
+CACHE_MAX_ENTRIES = 256
+CACHE_TTL_SECONDS = 3600
+
+_responses: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+# Calls currently awaiting the remote model, so identical concurrent requests share one call
+_inflight: "dict[str, asyncio.Future]" = {}
+
+
+def normalize_key(key_text: str) -> str:
+    """
+    Normalize a prompt for cache lookup
+    Drops the boilerplate "Instructions:" suffix and folds case and whitespace, so wording drift still hits
+    """
+    head = key_text.split("Instructions:", 1)[0]
+    return re.sub(r"\s+", " ", head).strip().lower()
+
+
+def cache_key(key_text: str) -> str:
+    """
+    Get the SHA-256 cache key of a normalized prompt
+    """
+    return hashlib.sha256(normalize_key(key_text).encode()).hexdigest()
+
+
+async def single_flight(key: str, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Await coro_factory(), or join an identical call for key that is already in flight
+    """
+    loop = asyncio.get_running_loop()
+    fut = _inflight.get(key)
+    if fut is not None and fut.get_loop() is loop:
+        try:
+            return await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            if not fut.cancelled():
+                raise
+            # The leading call was cancelled, not this one, so make the call here instead
+    
+    fut = _inflight[key] = loop.create_future()
+    try:
+        result = await coro_factory()
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    except Exception as e:
+        fut.set_exception(e)
+        # Mark the exception retrieved, it is re-raised here even when nobody joined the call
+        fut.exception()
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        if _inflight.get(key) is fut:
+            del _inflight[key]
+
+
+async def get_or_call(key_text: str, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Return the cached response for key_text, or await coro_factory() and cache its result
+    Failures are not cached, so callers' retry loops still reach the remote model
+    Concurrent misses for the same key share a single call
+    """
+    key = cache_key(key_text)
+    entry = _responses.get(key)
+    if entry is not None and time.monotonic() - entry[0] < CACHE_TTL_SECONDS:
+        _responses.move_to_end(key)
+        return entry[1]
+
+    result = await single_flight(key, coro_factory)
+    _responses[key] = (time.monotonic(), result)
+    _responses.move_to_end(key)
+    while len(_responses) > CACHE_MAX_ENTRIES:
+        _responses.popitem(last=False)
+    return result
@@ -1,308 +1,456 @@
 from __future__ import annotations
 
 import asyncio
+import random
 import time
 import json
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Callable, Sequence
+from dataclasses import dataclass
 
 from rich.console import Console
 
 # Removed old agents library imports - now using pydantic-ai directly
 
-from agent import History, get_historical_agent
-from agent import Culinary, get_culinary_agent
-from agent import Culture, get_culture_agent
-from agent import Architecture, get_architecture_agent
+from agent import get_historical_agent
+from agent import get_culinary_agent
+from agent import get_culture_agent
+from agent import get_architecture_agent
 from agent import Planner, get_planner_agent
-from agent import FinalTour, get_orchestrator_agent
+from agent import FinalTour, get_orchestrator_agent, get_orchestrator_stream_agent
+from agent import netmind_chat_model
 from printer import Printer
+from cache import get_or_call
+from netmind_config import netmind_slot
+import plan_cache
+
+# Average speaking rate used to turn tour duration into word budgets
+WORDS_PER_MINUTE = 150
+
+# Orchestrator output fields, in the order they are spoken
+FINAL_TOUR_SECTIONS = ("introduction", "architecture", "history", "culture", "culinary", "conclusion")
+
+# Prompt templates, filled with format_map so the literals are built once per process
+PLAN_PROMPT_TEMPLATE = "Query: {query} Interests: {interests} Duration: {duration}"
+
+RESEARCH_PROMPT_TEMPLATE = (
+    "Query: {query} Interests: {interests} Word Limit: {wl_lo} - {wl_hi}\n\n"
+    "Instructions: {instructions} The content should be approximately {wl_lo} words when spoken at a natural pace."
+)
+
+# The final tour prompt is split around its content sections, so the head and tail can be
+# filled before research finishes and only the sections are joined in afterwards
+FINAL_TOUR_PROMPT_HEAD = (
+    "Query: {query}\n"
+    "Selected Interests: {interests}\n"
+    "Total Tour Duration (in minutes): {duration}\n"
+    "Target Word Count: {total_words}\n\n"
+    "Content Sections:\n"
+)
+
+FINAL_TOUR_PROMPT_TAIL = (
+    "\n\nInstructions: Create a natural, conversational audio tour that focuses only on the selected interests. "
+    "Make it feel like a friendly guide walking alongside the visitor, sharing interesting stories and insights. "
+    "Use natural transitions between topics and maintain an engaging but relaxed pace. "
+    "Include specific locations and landmarks where possible. "
+    "Add natural pauses and transitions as if walking between locations. "
+    "Use phrases like 'as we walk', 'look to your left', 'notice how', etc. "
+    "Make it interactive and engaging, as if the guide is actually there with the visitor. "
+    "Start with a warm welcome and end with a natural closing thought. "
+    "The total content should be approximately {total_words} words when spoken at a natural pace of {words_per_minute} words per minute. "
+    "This will ensure the tour lasts approximately {duration} minutes."
+)
+
+
+
+@dataclass(frozen=True)
+class ResearchSpec:
+    """
+    Describes one research section: its agent, status text and prompt instructions
+    """
+    __slots__ = ("label", "get_agent", "status", "instructions")
+
+    label: str
+    get_agent: Callable
+    status: str
+    instructions: str
+
+
+# Research sections by interest, in dispatch order
+RESEARCH_SPECS = {
+    "Architecture": ResearchSpec(
+        "Architecture",
+        get_architecture_agent,
+        "Exploring architectural wonders...",
+        "Create engaging architectural content for an audio tour. Focus on visual descriptions and interesting design details. Make it conversational and include specific buildings and their unique features. Describe what visitors should look for and why it matters.",
+    ),
+    "History": ResearchSpec(
+        "History",
+        get_historical_agent,
+        "Researching historical highlights...",
+        "Create engaging historical content for an audio tour. Focus on interesting stories and personal connections. Make it conversational and include specific details that would be interesting to hear while walking. Include specific locations and landmarks where possible.",
+    ),
+    "Culinary": ResearchSpec(
+        "Culinary",
+        get_culinary_agent,
+        "Discovering local flavors...",
+        "Create engaging culinary content for an audio tour. Focus on local specialties, food history, and interesting stories about restaurants and dishes. Make it conversational and include specific recommendations. Describe the flavors and cultural significance of the food.",
+    ),
+    "Culture": ResearchSpec(
+        "Culture",
+        get_culture_agent,
+        "Exploring cultural highlights...",
+        "Create engaging cultural content for an audio tour. Focus on local traditions, arts, and community life. Make it conversational and include specific cultural venues and events. Describe the atmosphere and significance of cultural landmarks.",
+    ),
+}
+
+
+# Agent calls are retried with exponential backoff plus up to a second of jitter, so parallel
+# sections hitting the same outage do not retry in lockstep
+AGENT_MAX_RETRIES = 3
+AGENT_RETRY_INITIAL_DELAY = 1.0
+AGENT_RETRY_MAX_DELAY = 8.0
+
+# Status updates are queued and rendered in batches at most this often
+STATUS_RENDER_INTERVAL = 0.05
+
+
+async def run_agent(agent, prompt: str, model):
+    async with netmind_slot():
+        result = await agent.run(prompt, model=model)
+    return result.output
+
+
+def retry_delay(attempt: int) -> float:
+    """
+    Backoff before retry number `attempt` (1-based): 1s, 2s, 4s... plus jitter, capped
+    """
+    return min(AGENT_RETRY_MAX_DELAY, AGENT_RETRY_INITIAL_DELAY * 2 ** (attempt - 1) + random.uniform(0, 1))
+
+
+class RunStatus:
+    """
+    Status display of a single tour run
+    The manager is shared between sessions, so each run renders through its own printer, update queue and render task
+    """
+
+    def __init__(self) -> None:
+        self.printer = Printer(Console())
+        self._updates: asyncio.Queue = asyncio.Queue()
+        self._render_task = asyncio.create_task(self._render())
+
+    def update(self, item_id: str, content: str, is_done: bool = False) -> None:
+        """
+        Queue a status update for the next batched render
+        """
+        self._updates.put_nowait((item_id, content, is_done))
+
+    async def _render(self) -> None:
+        """
+        Apply queued status updates in batches, re-rendering once per batch
+        """
+        while True:
+            batch = [await self._updates.get()]
+            while not self._updates.empty():
+                batch.append(self._updates.get_nowait())
+            try:
+                for item_id, content, is_done in batch:
+                    self.printer.update_item(item_id, content, is_done=is_done, flush=False)
+                self.printer.flush()
+            finally:
+                for _ in batch:
+                    self._updates.task_done()
+            await asyncio.sleep(STATUS_RENDER_INTERVAL)
+
+    async def end(self) -> None:
+        # Render whatever is still queued before stopping the display
+        try:
+            if not self._render_task.done():
+                await self._updates.join()
+        finally:
+            self._render_task.cancel()
+            self.printer.end()
 
 
 class TourManager:
     """
     Orchestrates the full flow
+    Agents are shared between managers, each manager runs them with the model for its own API key
     """
 
-    def __init__(self) -> None:
-        self.console = Console()
-        self.printer = Printer(self.console)
+    def __init__(self, api_key: str | None = None) -> None:
+        self.api_key = api_key
+
+    async def run(self, query: str, interests: list, duration: str, concurrency: int = 4) -> None:
+        interests_csv = ', '.join(interests)
+        duration_min = int(duration)
+        total_words = duration_min * WORDS_PER_MINUTE
+        prompt_frame = self._final_tour_frame(query, interests_csv, duration_min, total_words)
+        status = RunStatus()
+        try:
+            research_results = await self._research_all(status, query, interests, interests_csv, duration_min, total_words, concurrency)
+            
+            # Get final tour with only selected interests
+            final_tour = await self._get_final_tour(
+                status,
+                self._final_tour_prompt(prompt_frame, interests, research_results)
+            )
+            
+            status.update("final_report", "", is_done=True)
+        finally:
+            await status.end()
+
+        # Return the final tour content directly as it's now a complete string
+        return final_tour
+
+    async def run_stream(self, query: str, interests: list, duration: str, concurrency: int = 4) -> AsyncIterator[str]:
+        """
+        Same flow as run, but yields the final tour as the orchestrator streams it
+        Each chunk is one or more finished paragraphs; joined with blank lines they form the full tour
+        """
+        interests_csv = ', '.join(interests)
+        duration_min = int(duration)
+        total_words = duration_min * WORDS_PER_MINUTE
+        prompt_frame = self._final_tour_frame(query, interests_csv, duration_min, total_words)
+        status = RunStatus()
+        try:
+            research_results = await self._research_all(status, query, interests, interests_csv, duration_min, total_words, concurrency)
+            
+            prompt = self._final_tour_prompt(prompt_frame, interests, research_results)
+            async for section in self._stream_final_tour(status, prompt):
+                yield section
+            
+            status.update("final_report", "", is_done=True)
+        finally:
+            await status.end()
 
-    async def run(self, query: str, interests: list, duration: str) -> None:
-        self.printer.update_item("start", "Starting tour research...", is_done=True)
+    async def _research_all(self, status: RunStatus, query: str, interests: list, interests_csv: str, duration_min: int, total_words: int, concurrency: int) -> dict[str, str]:
+        status.update("start", "Starting tour research...", is_done=True)
         
         # Get plan based on selected interests
-        planner = await self._get_plan(query, interests, duration)
+        planner = await self._get_plan(status, query, interests, interests_csv, duration_min)
         
-        # Initialize research results
-        research_results = {}
-        
-        # Calculate word limits based on duration
-        # Assuming average speaking rate of 150 words per minute
-        words_per_minute = 150
-        total_words = int(duration) * words_per_minute
-        words_per_section = total_words // len(interests)
+        words_per_section = total_words // max(1, len(interests))
         
         # Only research selected interests
-        if "Architecture" in interests:
-            research_results["architecture"] = await self._get_architecture(query, interests, words_per_section)
-        
-        if "History" in interests:
-            research_results["history"] = await self._get_history(query, interests, words_per_section)
+        research_tasks = {
+            spec.label.lower(): self._research(status, spec, query, interests_csv, words_per_section)
+            for interest, spec in RESEARCH_SPECS.items()
+            if interest in interests
+        }
         
-        if "Culinary" in interests:
-            research_results["culinary"] = await self._get_culinary(query, interests, words_per_section)
+        # The sections are independent, so run them concurrently with at most `concurrency` in flight
+        semaphore = asyncio.Semaphore(concurrency)
         
-        if "Culture" in interests:
-            research_results["culture"] = await self._get_culture(query, interests, words_per_section)
+        async def _gated(research):
+            async with semaphore:
+                return await research
         
-        # Get final tour with only selected interests
-        final_tour = await self._get_final_tour(
-            query, 
-            interests, 
-            duration, 
-            research_results
+        results = await asyncio.gather(
+            *(_gated(research) for research in research_tasks.values()),
+            return_exceptions=True
         )
         
-        self.printer.update_item("final_report", "", is_done=True)
-        self.printer.end()
-
-        # Return the final tour content directly as it's now a complete string
-        return final_tour
+        research_results: dict[str, str] = {}
+        for section, result in zip(research_tasks, results):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, Exception):
+                # One failed interest must not abort the others, fall back like an exhausted retry
+                result = f"{section.capitalize()} content for {query} is currently unavailable. Please try again later."
+            research_results[section] = result
+        return research_results
         
-    async def _get_plan(self, query: str, interests: list, duration: str) -> Planner:
-        self.printer.update_item("Planner", "Planning your personalized tour...")
-        
-        max_retries = 3
-        for attempt in range(max_retries):
+    async def _call_agent(self, status: RunStatus, item: str, key_text: str, get_agent: Callable, prompt: str, retry_status: str):
+        """
+        Run an agent through the response cache, retrying failures with jittered exponential backoff
+        Re-raises the last error once AGENT_MAX_RETRIES attempts have failed
+        """
+        # The getters already memoize their agents; resolve once so retries reuse the same instance
+        agent = get_agent()
+        model = netmind_chat_model(self.api_key)
+        for attempt in range(1, AGENT_MAX_RETRIES + 1):
             try:
-                result = await get_planner_agent().run(
-                    "Query: {} Interests: {} Duration: {}".format(query, ', '.join(interests), duration)
-                )
-                self.printer.update_item(
-                    "Planner",
-                    "Completed planning",
-                    is_done=True,
-                )
-                return result.output
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    self.printer.update_item(
-                        "Planner",
-                        f"Retrying planning... (attempt {attempt + 1}/{max_retries})"
-                    )
-                    await asyncio.sleep(2)
-                    continue
-                else:
-                    self.printer.update_item(
-                        "Planner",
-                        "Failed to generate plan after multiple attempts",
-                        is_done=True,
-                    )
-                    return f"Planning for {query} is currently unavailable. Please try again later."
+                return await get_or_call(key_text, lambda: run_agent(agent, prompt, model))
+            except Exception:
+                if attempt == AGENT_MAX_RETRIES:
+                    raise
+                status.update(item, f"{retry_status} (attempt {attempt}/{AGENT_MAX_RETRIES})")
+                await asyncio.sleep(retry_delay(attempt))
     
-    async def _get_history(self, query: str, interests: list, word_limit: int) -> History:
-        self.printer.update_item("History", "Researching historical highlights...")
+    async def _get_plan(self, status: RunStatus, query: str, interests: list, interests_csv: str, duration_min: int) -> Planner:
+        status.update("Planner", "Planning your personalized tour...")
         
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                result = await get_historical_agent().run(
-                    "Query: {} Interests: {} Word Limit: {} - {}\n\nInstructions: Create engaging historical content for an audio tour. Focus on interesting stories and personal connections. Make it conversational and include specific details that would be interesting to hear while walking. Include specific locations and landmarks where possible. The content should be approximately {} words when spoken at a natural pace.".format(query, ', '.join(interests), word_limit, word_limit + 20, word_limit)
-                )
-                self.printer.update_item(
-                    "History",
-                    "Completed history research",
-                    is_done=True,
-                )
-                return result.output
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    self.printer.update_item(
-                        "History",
-                        f"Retrying history research... (attempt {attempt + 1}/{max_retries})"
-                    )
-                    await asyncio.sleep(2)
-                    continue
-                else:
-                    self.printer.update_item(
-                        "History",
-                        "Failed to generate history content after multiple attempts",
-                        is_done=True,
-                    )
-                    return f"History content for {query} is currently unavailable. Please try again later."
-
-    async def _get_architecture(self, query: str, interests: list, word_limit: int):
-        self.printer.update_item("Architecture", "Exploring architectural wonders...")
+        # A tour of the same city and interests with a similar duration only needs its allocations rescaled
+        cached = plan_cache.lookup(query, interests, duration_min)
+        if cached is not None:
+            status.update(
+                "Planner",
+                "Completed planning from a similar tour",
+                is_done=True,
+            )
+            return plan_cache.adapt_plan(cached, duration_min)
         
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                result = await get_architecture_agent().run(
-                    "Query: {} Interests: {} Word Limit: {} - {}\n\nInstructions: Create engaging architectural content for an audio tour. Focus on visual descriptions and interesting design details. Make it conversational and include specific buildings and their unique features. Describe what visitors should look for and why it matters. The content should be approximately {} words when spoken at a natural pace.".format(query, ', '.join(interests), word_limit, word_limit + 20, word_limit)
-                )
-                self.printer.update_item(
-                    "Architecture",
-                    "Completed architecture research",
-                    is_done=True,
-                )
-                return result.output
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    self.printer.update_item(
-                        "Architecture",
-                        f"Retrying architecture research... (attempt {attempt + 1}/{max_retries})"
-                    )
-                    await asyncio.sleep(2)
-                    continue
-                else:
-                    self.printer.update_item(
-                        "Architecture",
-                        "Failed to generate architecture content after multiple attempts",
-                        is_done=True,
-                    )
-                    # Return a fallback content instead of raising
-                    return f"Architecture content for {query} is currently unavailable. Please try again later."
-    
-    async def _get_culinary(self, query: str, interests: list, word_limit: int):
-        self.printer.update_item("Culinary", "Discovering local flavors...")
+        prompt = PLAN_PROMPT_TEMPLATE.format_map({"query": query, "interests": interests_csv, "duration": duration_min})
         
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                result = await get_culinary_agent().run(
-                    "Query: {} Interests: {} Word Limit: {} - {}\n\nInstructions: Create engaging culinary content for an audio tour. Focus on local specialties, food history, and interesting stories about restaurants and dishes. Make it conversational and include specific recommendations. Describe the flavors and cultural significance of the food. The content should be approximately {} words when spoken at a natural pace.".format(query, ', '.join(interests), word_limit, word_limit + 20, word_limit)
-                )
-                self.printer.update_item(
-                    "Culinary",
-                    "Completed culinary research",
-                    is_done=True,
-                )
-                return result.output
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    self.printer.update_item(
-                        "Culinary",
-                        f"Retrying culinary research... (attempt {attempt + 1}/{max_retries})"
-                    )
-                    await asyncio.sleep(2)
-                    continue
-                else:
-                    self.printer.update_item(
-                        "Culinary",
-                        "Failed to generate culinary content after multiple attempts",
-                        is_done=True,
-                    )
-                    return f"Culinary content for {query} is currently unavailable. Please try again later."
-    
-    async def _get_culture(self, query: str, interests: list, word_limit: int):
-        self.printer.update_item("Culture", "Exploring cultural highlights...")
+        try:
+            output = await self._call_agent(
+                status,
+                "Planner",
+                f"Planner {prompt}",
+                get_planner_agent,
+                prompt,
+                "Retrying planning..."
+            )
+        except Exception:
+            status.update(
+                "Planner",
+                "Failed to generate plan after multiple attempts",
+                is_done=True,
+            )
+            return f"Planning for {query} is currently unavailable. Please try again later."
         
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                result = await get_culture_agent().run(
-                    "Query: {} Interests: {} Word Limit: {} - {}\n\nInstructions: Create engaging cultural content for an audio tour. Focus on local traditions, arts, and community life. Make it conversational and include specific cultural venues and events. Describe the atmosphere and significance of cultural landmarks. The content should be approximately {} words when spoken at a natural pace.".format(query, ', '.join(interests), word_limit, word_limit + 20, word_limit)
-                )
-                self.printer.update_item(
-                    "Culture",
-                    "Completed culture research",
-                    is_done=True,
-                )
-                return result.output
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    self.printer.update_item(
-                        "Culture",
-                        f"Retrying culture research... (attempt {attempt + 1}/{max_retries})"
-                    )
-                    await asyncio.sleep(2)
-                    continue
-                else:
-                    self.printer.update_item(
-                        "Culture",
-                        "Failed to generate culture content after multiple attempts",
-                        is_done=True,
-                    )
-                    return f"Culture content for {query} is currently unavailable. Please try again later."
+        plan_cache.store(query, interests, duration_min, output)
+        status.update(
+            "Planner",
+            "Completed planning",
+            is_done=True,
+        )
+        return output
     
-    async def _get_final_tour(self, query: str, interests: list, duration: float, research_results: dict):
-        self.printer.update_item("Final Tour", "Creating your personalized tour...")
+    async def _research(self, status: RunStatus, spec: ResearchSpec, query: str, interests_csv: str, word_limit: int) -> str:
+        status.update(spec.label, spec.status)
+        topic = spec.label.lower()
+        
+        prompt = RESEARCH_PROMPT_TEMPLATE.format_map({
+            "query": query,
+            "interests": interests_csv,
+            "wl_lo": word_limit,
+            "wl_hi": word_limit + 20,
+            "instructions": spec.instructions,
+        })
+        
+        try:
+            output = await self._call_agent(
+                status,
+                spec.label,
+                f"{spec.label} {prompt}",
+                spec.get_agent,
+                prompt,
+                f"Retrying {topic} research..."
+            )
+        except Exception:
+            status.update(
+                spec.label,
+                f"Failed to generate {topic} content after multiple attempts",
+                is_done=True,
+            )
+            return f"{spec.label} content for {query} is currently unavailable. Please try again later."
         
+        status.update(
+            spec.label,
+            f"Completed {topic} research",
+            is_done=True,
+        )
+        # Research agents wrap their text in a single-field model
+        return output.output
+
+    def _final_tour_frame(self, query: str, interests_csv: str, duration_min: int, total_words: int) -> tuple[str, str]:
+        """
+        Fill the parts of the final tour prompt that do not depend on research results
+        """
+        fields = {"query": query, "interests": interests_csv, "duration": duration_min, "total_words": total_words, "words_per_minute": WORDS_PER_MINUTE}
+        return FINAL_TOUR_PROMPT_HEAD.format_map(fields), FINAL_TOUR_PROMPT_TAIL.format_map(fields)
+
+    def _final_tour_prompt(self, prompt_frame: tuple[str, str], interests: list, research_results: dict[str, str]) -> str:
         # Build content sections based on selected interests
-        content_sections = []
-        for interest in interests:
-            if interest.lower() in research_results:
-                result_obj = research_results[interest.lower()]
-                # Extract the output string from the result object
-                if hasattr(result_obj, 'output'):
-                    content_sections.append(result_obj.output)
-                else:
-                    content_sections.append(str(result_obj))
+        content_sections = [research_results[k] for k in (i.lower() for i in interests) if k in research_results]
+        
+        head, tail = prompt_frame
+        return ''.join((head, '\n\n'.join(content_sections), tail))
+
+    async def _get_final_tour(self, status: RunStatus, prompt: str):
+        status.update("Final Tour", "Creating your personalized tour...")
         
-        # Calculate total words based on duration
-        # Assuming average speaking rate of 150 words per minute
-        words_per_minute = 150
-        total_words = int(duration) * words_per_minute
+        try:
+            final_tour_obj = await self._call_agent(
+                status,
+                "Final Tour",
+                f"Final Tour {prompt}",
+                get_orchestrator_agent,
+                prompt,
+                "Connection issue, retrying..."
+            )
+        except Exception:
+            status.update(
+                "Final Tour",
+                "Failed to generate final tour after multiple attempts",
+                is_done=True,
+            )
+            raise
         
-        # Create the prompt with proper string formatting
-        prompt = (
-            "Query: {}\n"
-            "Selected Interests: {}\n"
-            "Total Tour Duration (in minutes): {}\n"
-            "Target Word Count: {}\n\n"
-            "Content Sections:\n{}\n\n"
-            "Instructions: Create a natural, conversational audio tour that focuses only on the selected interests. "
-            "Make it feel like a friendly guide walking alongside the visitor, sharing interesting stories and insights. "
-            "Use natural transitions between topics and maintain an engaging but relaxed pace. "
-            "Include specific locations and landmarks where possible. "
-            "Add natural pauses and transitions as if walking between locations. "
-            "Use phrases like 'as we walk', 'look to your left', 'notice how', etc. "
-            "Make it interactive and engaging, as if the guide is actually there with the visitor. "
-            "Start with a warm welcome and end with a natural closing thought. "
-            "The total content should be approximately {} words when spoken at a natural pace of 150 words per minute. "
-            "This will ensure the tour lasts approximately {} minutes."
-        ).format(
-            query,
-            ', '.join(interests),
-            duration,
-            total_words,
-            '\n\n'.join(content_sections),
-            total_words,
-            duration
+        status.update(
+            "Final Tour",
+            "Completed Final Tour Guide Creation",
+            is_done=True,
         )
         
-        # Add retry logic to handle network connection issues
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                result = await get_orchestrator_agent().run(
-                    prompt
-                )
-                
-                self.printer.update_item(
-                    "Final Tour",
-                    "Completed Final Tour Guide Creation",
-                    is_done=True,
-                )
-                
-                # Combine all sections of the FinalTour for complete audio content
-                final_tour_obj = result.output
-                complete_tour = f"{final_tour_obj.introduction}\n\n{final_tour_obj.architecture}\n\n{final_tour_obj.history}\n\n{final_tour_obj.culture}\n\n{final_tour_obj.culinary}\n\n{final_tour_obj.conclusion}"
-                
-                return complete_tour
-                
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    self.printer.update_item(
-                        "Final Tour",
-                        f"Connection issue, retrying... (attempt {attempt + 1}/{max_retries})"
-                    )
-                    await asyncio.sleep(2)  # Wait 2 seconds before retry
-                    continue
-                else:
-                    self.printer.update_item(
-                        "Final Tour",
-                        "Failed to generate final tour after multiple attempts",
-                        is_done=True,
+        # Combine all sections of the FinalTour for complete audio content
+        complete_tour = f"{final_tour_obj.introduction}\n\n{final_tour_obj.architecture}\n\n{final_tour_obj.history}\n\n{final_tour_obj.culture}\n\n{final_tour_obj.culinary}\n\n{final_tour_obj.conclusion}"
+        
+        return complete_tour
+
+    async def _stream_final_tour(self, status: RunStatus, prompt: str) -> AsyncIterator[str]:
+        status.update("Final Tour", "Streaming your personalized tour...")
+        
+        # Index of the section being written, and how much of each section's text has been yielded
+        current = 0
+        sent = dict.fromkeys(FINAL_TOUR_SECTIONS, 0)
+        yielded = False
+        try:
+            async with netmind_slot(), get_orchestrator_stream_agent().run_stream(prompt, model=netmind_chat_model(self.api_key)) as result:
+                async for partial in result.stream_output():
+                    # A section is complete once the model has started writing any later one. Sections may be
+                    # omitted or come out of order, so whatever is skipped or cut short is taken from the final output
+                    following = next(
+                        (i for i in range(current + 1, len(FINAL_TOUR_SECTIONS)) if FINAL_TOUR_SECTIONS[i] in partial),
+                        None
                     )
-                    raise e
\ No newline at end of file
+                    if following is not None:
+                        name = FINAL_TOUR_SECTIONS[current]
+                        text = partial.get(name) or ""
+                        rest = text[sent[name]:].strip()
+                        sent[name] = len(text)
+                        current = following
+                        if rest:
+                            yielded = True
+                            yield rest
+                    
+                    # Within the open section, hand over every paragraph the model has finished
+                    name = FINAL_TOUR_SECTIONS[current]
+                    text = partial.get(name) or ""
+                    end = text.rfind("\n\n", sent[name])
+                    if end > sent[name]:
+                        paragraphs = text[sent[name]:end].strip()
+                        sent[name] = end + 2
+                        if paragraphs:
+                            yielded = True
+                            yield paragraphs
+                
+                final_tour_obj = await result.get_output()
+                for name in FINAL_TOUR_SECTIONS:
+                    rest = (final_tour_obj.get(name) or "")[sent[name]:].strip()
+                    if rest:
+                        yielded = True
+                        yield rest
+        except Exception:
+            if yielded:
+                raise
+            # Nothing has reached the caller yet, so fall back to the non-streaming orchestrator and its retries
+            yield await self._get_final_tour(status, prompt)
+            return
+        
+        status.update(
+            "Final Tour",
+            "Completed Final Tour Guide Creation",
+            is_done=True,
+        )
@@ -1,7 +1,39 @@
 import os
+import io
+import re
+import atexit
+import json
+import random
+import logging
+import time
+import asyncio
+import functools
+import shutil
+import weakref
+import hashlib
+import email.utils
+import tempfile
+import threading
+import uuid
+import concurrent.futures
+import httpx
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.exceptions import ReadTimeoutError, ProtocolError
+from requests.exceptions import (
+    ConnectionError as ReqConnectionError,
+    Timeout,
+    RequestException
+)
+from collections import OrderedDict
 from typing import Optional, Dict, Any
-from openai import OpenAI, AsyncOpenAI
+from openai import AsyncOpenAI
+from cache import single_flight
+
+# Logging is configured by the application, not on every TTS call
+logger = logging.getLogger(__name__)
 
 class NetMindConfig:
     """
@@ -15,6 +47,18 @@ class NetMindConfig:
         self.base_url = "https://api.netmind.ai/inference-api/openai/v1"
         self.model_name = "openai/gpt-oss-20b"
         self.tts_model = "ResembleAI/Chatterbox"  # NetMind TTS model
+        # Extra fields for the TTS request, as a JSON object in NETMIND_TTS_AUDIO_OPTIONS. Speech does not need
+        # music-grade audio, e.g. '{"sample_rate": 22050, "bitrate": 64}' roughly halves the bytes to download,
+        # but these fields are not documented by NetMind, so the service defaults are used unless opted in
+        audio_options = os.getenv('NETMIND_TTS_AUDIO_OPTIONS', '{}')
+        try:
+            self.tts_audio_options = json.loads(audio_options)
+        except ValueError:
+            self.tts_audio_options = None
+        if not isinstance(self.tts_audio_options, dict):
+            raise ValueError(f"NETMIND_TTS_AUDIO_OPTIONS must be a JSON object, got: {audio_options!r}")
+        # Pooled HTTP/2 client for chat completions, created on first use inside the event loop
+        self._client: Optional[httpx.AsyncClient] = None
         
     def get_headers(self) -> Dict[str, str]:
         """
@@ -25,23 +69,53 @@ class NetMindConfig:
             'Content-Type': 'application/json'
         }
     
-    def chat_completion(self, messages: list, **kwargs) -> Dict[str, Any]:
+    def _get_client(self) -> httpx.AsyncClient:
+        """
+        Get the pooled chat completion client, creating it on first use
+        """
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.get_headers(),
+                http2=True,
+                timeout=httpx.Timeout(60.0, connect=10.0),
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        return self._client
+    
+    async def chat_completion(self, messages: list, **kwargs) -> Dict[str, Any]:
         """
         Call NetMind chat completion API
         """
-        url = f"{self.base_url}/chat/completions"
         payload = {
             "model": self.model_name,
             "messages": messages,
             **kwargs
         }
         
-        response = requests.post(url, headers=self.get_headers(), json=payload, timeout=60)
+        body = orjson.dumps(payload)
         
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"API request failed: {response.status_code} - {response.text}")
+        async def _post():
+            # Content-Type is already set on the client
+            async with netmind_slot():
+                response = await self._get_client().post("/chat/completions", content=body)
+            
+            if response.status_code == 200:
+                return orjson.loads(response.content)
+            else:
+                raise Exception(f"API request failed: {response.status_code} - {response.text}")
+        
+        # Identical requests already in flight share one upstream call
+        key = hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+        return await single_flight(f"chat:{key}", _post)
+    
+    async def aclose(self) -> None:
+        """
+        Close the pooled chat completion client
+        """
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
     
     def get_model_name(self) -> str:
         """
@@ -55,17 +129,65 @@ class NetMindConfig:
         """
         return self.tts_model
     
+    def get_tts_payload(self, text: str) -> Dict[str, Any]:
+        """
+        Build the TTS request payload, including the configured audio options
+        """
+        return {
+            **self.tts_audio_options,
+            "model": self.tts_model,
+            "input": text
+        }
+    
 
 
 # Global NetMind configuration instance - will be initialized when API key is provided
-netmind_config = None
+netmind_config: Optional[NetMindConfig] = None
+
+# AsyncOpenAI clients by API key, shared so agents reuse one connection pool. Sessions with different
+# keys run side by side, so a client is never replaced or closed while another run may be using it
+_netmind_models: Dict[str, AsyncOpenAI] = {}
+_netmind_models_lock = threading.Lock()
+
+def _close_netmind_config():
+    """
+    Release the pooled chat completion connections at interpreter exit
+    """
+    if netmind_config is None or netmind_config._client is None:
+        return
+    try:
+        asyncio.run(netmind_config.aclose())
+    except Exception:
+        # The client belongs to a loop that may already be gone; the sockets close with the process
+        pass
+
+atexit.register(_close_netmind_config)
+
+# Upper bound on NetMind LLM and TTS requests in flight at once, to stay under the account rate limit
+NETMIND_MAX_CONCURRENCY = int(os.getenv("NETMIND_MAX_CONCURRENCY", "8"))
+
+# One semaphore per event loop, since asyncio primitives cannot be shared across loops
+_netmind_semaphores = weakref.WeakKeyDictionary()
+
+def netmind_slot() -> asyncio.Semaphore:
+    """
+    Get the semaphore limiting NetMind requests on the running event loop, used as `async with netmind_slot():`
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _netmind_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _netmind_semaphores[loop] = asyncio.Semaphore(NETMIND_MAX_CONCURRENCY)
+    return semaphore
 
 # Setup default NetMind API configuration
 def setup_netmind_api(api_key: Optional[str] = None):
     """
     Setup NetMind API configuration
+    Reruns with an unchanged key reuse the existing configuration
     """
     global netmind_config
+    if netmind_config is not None and netmind_config.api_key == (api_key or os.getenv('NETMIND_API_KEY')):
+        return netmind_config
     netmind_config = NetMindConfig(api_key)
     return netmind_config
 
@@ -73,42 +195,54 @@ def setup_netmind_api(api_key: Optional[str] = None):
 def get_netmind_config() -> NetMindConfig:
     """
     Get configured NetMind configuration instance
+    Falls back to NETMIND_API_KEY from the environment when setup_netmind_api() has not been called
     """
     if netmind_config is None:
-        raise ValueError("NetMind API not configured. Please call setup_netmind_api() first.")
+        if not os.getenv('NETMIND_API_KEY'):
+            raise ValueError("NetMind API not configured. Please call setup_netmind_api() first.")
+        return setup_netmind_api()
     return netmind_config
 
 # Convenience function to get NetMind model
-def get_netmind_model():
+def get_netmind_model(api_key: Optional[str] = None):
     """
-    Get configured AsyncOpenAI client for agents library
+    Get the AsyncOpenAI client for agents library, for api_key or else the configured key
+    The client is created once per API key and reused across calls
     """
-    if netmind_config is None:
-        raise ValueError("NetMind API not configured. Please call setup_netmind_api() first.")
-    return AsyncOpenAI(
-        base_url=netmind_config.base_url,
-        api_key=netmind_config.api_key
-    )
+    config = get_netmind_config()
+    api_key = api_key or config.api_key
+    with _netmind_models_lock:
+        client = _netmind_models.get(api_key)
+        if client is None:
+            client = _netmind_models[api_key] = AsyncOpenAI(
+                base_url=config.base_url,
+                api_key=api_key,
+                # Concurrent agent calls share HTTP/2 connections instead of opening one socket each
+                http_client=httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+                )
+            )
+        return client
 
 def get_netmind_model_name() -> str:
     """
     Get NetMind model name string
     """
-    if netmind_config is None:
-        raise ValueError("NetMind API not configured. Please call setup_netmind_api() first.")
-    return netmind_config.get_model_name()
+    return get_netmind_config().get_model_name()
 
 def get_netmind_tts_model() -> str:
     """
     Get NetMind TTS model name
     """
-    if netmind_config is None:
-        raise ValueError("NetMind API not configured. Please call setup_netmind_api() first.")
-    return netmind_config.get_tts_model()
+    return get_netmind_config().get_tts_model()
 
 class TTSError(Exception):
     """Base exception for TTS operations"""
-    pass
+    # Seconds the server asked us to wait before retrying, from its Retry-After header
+    retry_after: Optional[float] = None
+    # False for failures a retry cannot fix, such as a rejected request or API key
+    retryable: bool = True
 
 class TTSConnectionError(TTSError):
     """Network connection issues"""
@@ -126,6 +260,443 @@ class TTSQuotaError(TTSError):
     """API quota exceeded"""
     pass
 
+# Exception raised for a failed TTS HTTP status; any status not listed is a TTSAPIError
+TTS_STATUS_ERRORS = {429: TTSQuotaError}
+
+# Statuses that fail the same way on every retry (bad request, bad key, missing resource), so they fail fast
+TTS_FATAL_STATUSES = frozenset([400, 401, 403, 404, 422])
+
+def tts_status_error(status_code: int, message: str, headers) -> TTSError:
+    """
+    Build the TTSError for a failed TTS HTTP response, with its retry hints
+    """
+    error = TTS_STATUS_ERRORS.get(status_code, TTSAPIError)(message)
+    error.retry_after = parse_retry_after(headers.get('Retry-After'))
+    error.retryable = status_code not in TTS_FATAL_STATUSES
+    return error
+
+# TTS retries wait a uniformly random time up to an exponentially growing, capped ceiling
+# ("full jitter"), which spreads out clients that failed together
+TTS_RETRY_BASE_DELAY = 0.5
+TTS_RETRY_MAX_DELAY = 30.0
+
+def full_jitter_delay(attempt: int) -> float:
+    """
+    Backoff after failed attempt number `attempt` (1-based)
+    """
+    return random.uniform(0, min(TTS_RETRY_MAX_DELAY, TTS_RETRY_BASE_DELAY * 2 ** attempt))
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header (delay seconds or HTTP date) into seconds, capped at TTS_RETRY_MAX_DELAY
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(TTS_RETRY_MAX_DELAY, max(0.0, seconds))
+
+class FullJitterRetry(Retry):
+    """
+    urllib3 Retry whose exponential backoff is drawn uniformly from zero up to the capped delay
+    """
+    
+    def get_backoff_time(self) -> float:
+        backoff = min(TTS_RETRY_MAX_DELAY, super().get_backoff_time())
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+# Bulkhead for the sync TTS path: at most this many calls in flight, one per pooled connection.
+# Callers wait up to TTS_BULKHEAD_TIMEOUT seconds for a free slot before failing
+TTS_SYNC_BULKHEAD_SIZE = int(os.getenv("NETMIND_TTS_MAX_CONCURRENT", "20"))
+TTS_BULKHEAD_TIMEOUT = 30.0
+_TTS_BULKHEAD = threading.BoundedSemaphore(TTS_SYNC_BULKHEAD_SIZE)
+
+# Retried synthesis POSTs carry an Idempotency-Key that is new for every call and shared by its retries,
+# so a retry after a lost response does not start a second generation. For an endpoint that ignores the header, set
+# NETMIND_TTS_RETRY_POST=0 to only retry the download GET
+TTS_RETRY_POST = os.getenv('NETMIND_TTS_RETRY_POST', '1') != '0'
+
+# One pooled session for the sync TTS path, so consecutive calls reuse TLS connections.
+# The adapter is the only retry layer: full-jitter backoff on connection errors and 429/5xx
+_TTS_RETRY = FullJitterRetry(
+    total=3,
+    backoff_factor=1,
+    status_forcelist=frozenset([429, 500, 502, 503, 504]),
+    allowed_methods=frozenset(["POST", "GET"] if TTS_RETRY_POST else ["GET"]),
+    raise_on_status=False,  # Don't raise on HTTP errors, handle manually
+    respect_retry_after_header=True  # Respect server's retry-after header
+)
+_TTS_SESSION = requests.Session()
+_TTS_ADAPTER = HTTPAdapter(
+    max_retries=_TTS_RETRY,
+    pool_connections=32,
+    pool_maxsize=TTS_SYNC_BULKHEAD_SIZE,
+    pool_block=False     # Don't block when pool is full
+)
+_TTS_SESSION.mount("http://", _TTS_ADAPTER)
+_TTS_SESSION.mount("https://", _TTS_ADAPTER)
+atexit.register(_TTS_SESSION.close)
+
+class _Breaker:
+    """
+    Circuit breaker for the TTS endpoint: after repeated failed calls it fails fast for a cooldown,
+    then lets a single probe call through to decide whether to close again
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    # How often calls queued behind a half-open probe check for its verdict
+    PROBE_POLL_INTERVAL = 0.1
+    
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, probe_wait: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.probe_wait = probe_wait
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+    
+    def _admit(self):
+        """
+        Admit a call, returning (None, False), or (error to fail it with, whether a probe's verdict is pending)
+        The caller holds the lock
+        """
+        if self.state == self.CLOSED:
+            return None, False
+        if self.state == self.OPEN:
+            remaining = self.recovery_timeout - (time.monotonic() - self.opened_at)
+            if remaining > 0:
+                return TTSAPIError(f"TTS service unavailable (circuit open), retry in {int(remaining) + 1}s"), False
+            self.state = self.HALF_OPEN
+        if self._probe_in_flight:
+            return TTSAPIError("TTS service unavailable (circuit half-open, probe in progress)"), True
+        self._probe_in_flight = True
+        return None, False
+    
+    def before_call(self) -> None:
+        """
+        Raise TTSAPIError instead of letting a call through while the circuit is open
+        While a half-open probe is in flight, wait up to probe_wait seconds for its verdict first
+        """
+        deadline = time.monotonic() + self.probe_wait
+        while True:
+            with self._lock:
+                error, pending = self._admit()
+            if error is None:
+                return
+            if not pending or time.monotonic() >= deadline:
+                raise error
+            time.sleep(self.PROBE_POLL_INTERVAL)
+    
+    async def before_call_async(self) -> None:
+        """
+        before_call for coroutines, waiting for a half-open probe without blocking the event loop
+        """
+        deadline = time.monotonic() + self.probe_wait
+        while True:
+            with self._lock:
+                error, pending = self._admit()
+            if error is None:
+                return
+            if not pending or time.monotonic() >= deadline:
+                raise error
+            await asyncio.sleep(self.PROBE_POLL_INTERVAL)
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failure_count = 0
+            self._probe_in_flight = False
+    
+    def release_probe(self) -> None:
+        """
+        Let another probe through after one ended without a verdict, e.g. on cancellation
+        """
+        with self._lock:
+            self._probe_in_flight = False
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failure_count += 1
+            if self.state == self.HALF_OPEN or self.failure_count >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._probe_in_flight = False
+    
+    def record_outcome(self, error: Optional[BaseException]) -> None:
+        """
+        Record how a call ended; only failures that point at the service being down count towards opening
+        """
+        if error is None:
+            self.record_success()
+        elif tts_outage(error):
+            self.record_failure()
+        else:
+            self.release_probe()
+
+def tts_outage(error: BaseException) -> bool:
+    """
+    Whether a failed TTS call points at a service outage (network, timeout, 5xx),
+    rather than a rejected request, a bad API key, exhausted quota or cancellation
+    """
+    return isinstance(error, TTSError) and error.retryable and not isinstance(error, TTSQuotaError)
+
+# One breaker per API key, shared by the sync and async TTS paths, so a user with a bad key
+# or an exhausted quota cannot block TTS for everybody else
+_tts_breakers: Dict[str, _Breaker] = {}
+_tts_breakers_lock = threading.Lock()
+
+def tts_breaker(config: NetMindConfig) -> _Breaker:
+    """
+    Get the TTS circuit breaker for the configuration's API key
+    """
+    with _tts_breakers_lock:
+        breaker = _tts_breakers.get(config.api_key)
+        if breaker is None:
+            breaker = _tts_breakers[config.api_key] = _Breaker()
+        return breaker
+
+# Recently synthesized clips kept in memory, evicting least recently used beyond the byte budget
+TTS_MEMORY_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+_tts_memory_cache: "OrderedDict[bytes, bytes]" = OrderedDict()
+_tts_memory_cache_bytes = 0
+_tts_memory_cache_lock = threading.Lock()
+
+def tts_cache_key(config: NetMindConfig, text: str) -> bytes:
+    """
+    Get the cache key for synthesizing text with the configured TTS model and audio options
+    """
+    options = json.dumps(config.tts_audio_options, sort_keys=True)
+    return hashlib.blake2b(f"{config.get_tts_model()}\0{options}\0{text}".encode(), digest_size=16).digest()
+
+def _tts_memory_cache_get(key: bytes) -> Optional[bytes]:
+    with _tts_memory_cache_lock:
+        audio = _tts_memory_cache.get(key)
+        if audio is not None:
+            _tts_memory_cache.move_to_end(key)
+        return audio
+
+def _tts_memory_cache_put(key: bytes, audio: bytes) -> None:
+    global _tts_memory_cache_bytes
+    if len(audio) > TTS_MEMORY_CACHE_MAX_BYTES:
+        return
+    with _tts_memory_cache_lock:
+        previous = _tts_memory_cache.pop(key, None)
+        if previous is not None:
+            _tts_memory_cache_bytes -= len(previous)
+        _tts_memory_cache[key] = audio
+        _tts_memory_cache_bytes += len(audio)
+        while _tts_memory_cache_bytes > TTS_MEMORY_CACHE_MAX_BYTES:
+            _, evicted = _tts_memory_cache.popitem(last=False)
+            _tts_memory_cache_bytes -= len(evicted)
+
+# Clips are also persisted on disk, so they survive restarts; NETMIND_TTS_CACHE_DISABLE=1 turns this off.
+# The directory is kept under NETMIND_TTS_CACHE_MAX_BYTES by evicting the least recently used files
+TTS_DISK_CACHE_DIR = os.getenv('NETMIND_TTS_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'netmind_tts'))
+TTS_DISK_CACHE_DISABLED = os.getenv('NETMIND_TTS_CACHE_DISABLE') == '1'
+TTS_DISK_CACHE_MAX_BYTES = int(os.getenv('NETMIND_TTS_CACHE_MAX_BYTES', str(512 * 1024 * 1024)))
+
+# Scanning the directory on every write would be wasteful, so it is curated after every 1/16th of the budget
+# written; the first write after startup curates right away, since earlier runs may have left it over budget
+_TTS_DISK_CACHE_CURATE_BYTES = TTS_DISK_CACHE_MAX_BYTES // 16
+_tts_disk_cache_written = _TTS_DISK_CACHE_CURATE_BYTES
+_tts_disk_cache_lock = threading.Lock()
+
+def _tts_disk_cache_path(key: bytes) -> str:
+    return os.path.join(TTS_DISK_CACHE_DIR, f"{key.hex()}.mp3")
+
+def _touch_cache_file(path: str) -> None:
+    """
+    Mark a cache file as recently used, so curation evicts it last
+    """
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+# Suffix of files still being written into a cache directory, which curation leaves alone
+CACHE_PARTIAL_SUFFIX = ".part"
+
+def curate_cache_dir(directory: str, max_bytes: int) -> None:
+    """
+    Delete the least recently used files under directory once they exceed max_bytes
+    Other sessions and processes share cache directories, so files may vanish mid-scan
+    """
+    entries = []
+    for root, _, names in os.walk(directory):
+        for name in names:
+            # Files still being written are not cache entries yet
+            if name.endswith(CACHE_PARTIAL_SUFFIX):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total_size -= size
+
+def _note_disk_cache_write(size: int) -> None:
+    global _tts_disk_cache_written
+    with _tts_disk_cache_lock:
+        _tts_disk_cache_written += size
+        if _tts_disk_cache_written < _TTS_DISK_CACHE_CURATE_BYTES:
+            return
+        _tts_disk_cache_written = 0
+    try:
+        curate_cache_dir(TTS_DISK_CACHE_DIR, TTS_DISK_CACHE_MAX_BYTES)
+    except OSError:
+        # Curation is best effort like the rest of the disk cache
+        pass
+
+def _tts_cache_get(key: bytes) -> Optional[bytes]:
+    """
+    Look a clip up in memory, then on disk
+    """
+    audio = _tts_memory_cache_get(key)
+    if audio is not None:
+        return audio
+    return _tts_disk_cache_get(key)
+
+def _tts_disk_cache_get(key: bytes) -> Optional[bytes]:
+    """
+    Look a clip up on disk, promoting a hit into memory
+    """
+    if TTS_DISK_CACHE_DISABLED:
+        return None
+    path = _tts_disk_cache_path(key)
+    try:
+        with open(path, 'rb') as f:
+            audio = f.read()
+    except OSError:
+        return None
+    _touch_cache_file(path)
+    _tts_memory_cache_put(key, audio)
+    return audio
+
+def _tts_cache_put(key: bytes, audio: bytes) -> None:
+    """
+    Store a clip in memory and, atomically, on disk
+    """
+    _tts_memory_cache_put(key, audio)
+    _tts_disk_cache_put(key, audio)
+
+def _tts_disk_cache_put(key: bytes, audio: bytes) -> None:
+    if TTS_DISK_CACHE_DISABLED:
+        return
+    _write_cache_file(_tts_disk_cache_path(key), audio)
+
+def _write_cache_file(path: str, data) -> None:
+    """
+    Atomically write a cache file from bytes, or from a binary file read to its end
+    The disk cache is best effort, so failures are ignored
+    """
+    directory = os.path.dirname(path)
+    tmp_path = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Write under a temporary name first so readers never see a partial file
+        with tempfile.NamedTemporaryFile(dir=directory, suffix=CACHE_PARTIAL_SUFFIX, delete=False) as f:
+            tmp_path = f.name
+            if isinstance(data, (bytes, bytearray)):
+                f.write(data)
+            else:
+                shutil.copyfileobj(data, f)
+            size = f.tell()
+        os.replace(tmp_path, path)
+        tmp_path = None
+        _note_disk_cache_write(size)
+    except OSError:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+# Conditional GET for audio downloads: with NETMIND_TTS_CONDITIONAL_GET=1, downloaded clips are kept with
+# their ETag / Last-Modified, and a repeat fetch of the same URL that returns 304 is served from disk.
+# Only useful when the service hands out stable download URLs, hence off by default
+TTS_CONDITIONAL_GET = os.getenv('NETMIND_TTS_CONDITIONAL_GET') == '1'
+
+def _download_cache_paths(download_url: str):
+    key = hashlib.blake2b(download_url.encode(), digest_size=16).hexdigest()
+    directory = os.path.join(TTS_DISK_CACHE_DIR, 'downloads')
+    return os.path.join(directory, f"{key}.mp3"), os.path.join(directory, f"{key}.json")
+
+def conditional_download_headers(download_url: str) -> Dict[str, str]:
+    """
+    Get If-None-Match / If-Modified-Since headers for a previously downloaded URL, if any
+    """
+    if not TTS_CONDITIONAL_GET:
+        return {}
+    body_path, meta_path = _download_cache_paths(download_url)
+    if not os.path.exists(body_path):
+        return {}
+    try:
+        with open(meta_path, 'rb') as f:
+            meta = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    headers = {}
+    if meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    return headers
+
+def open_cached_download(download_url: str):
+    """
+    Open the stored body of a download that the server answered with 304 Not Modified, or return None
+    """
+    body_path = _download_cache_paths(download_url)[0]
+    try:
+        f = open(body_path, 'rb')
+    except OSError:
+        return None
+    _touch_cache_file(body_path)
+    return f
+
+def read_cached_download(download_url: str) -> Optional[bytes]:
+    """
+    Get the stored body of a download that the server answered with 304 Not Modified
+    """
+    f = open_cached_download(download_url)
+    if f is None:
+        return None
+    with f:
+        return f.read()
+
+def store_download(download_url: str, response_headers, audio) -> None:
+    """
+    Keep a downloaded clip and its validators for later conditional fetches
+    The clip is bytes, or a binary file positioned at its start, which is copied without loading it into memory
+    """
+    if not TTS_CONDITIONAL_GET:
+        return
+    etag = response_headers.get('ETag')
+    last_modified = response_headers.get('Last-Modified')
+    if not etag and not last_modified:
+        return
+    body_path, meta_path = _download_cache_paths(download_url)
+    _write_cache_file(body_path, audio)
+    _write_cache_file(meta_path, orjson.dumps({'etag': etag, 'last_modified': last_modified}))
+
 def create_tts_audio(text, api_key=None, progress_callback=None):
     """
     Create TTS audio using NetMind API with robust error handling
@@ -146,193 +717,550 @@ def create_tts_audio(text, api_key=None, progress_callback=None):
         TTSQuotaError: API quota exceeded
         TTSError: General TTS operation failures
     """
-    import time
-    import logging
-    import json
-    from requests.adapters import HTTPAdapter
-    from urllib3.util.retry import Retry
-    from requests.exceptions import (
-        ConnectionError, 
-        Timeout, 
-        RequestException, 
-        HTTPError,
-        TooManyRedirects
-    )
+    config = netmind_config if api_key is None else NetMindConfig(api_key)
     
-    # Configure logging for TTS operations
-    logging.basicConfig(level=logging.INFO)
-    logger = logging.getLogger(__name__)
+    cache_key = tts_cache_key(config, text)
+    cached = _tts_cache_get(cache_key)
+    if cached is not None:
+        if progress_callback:
+            progress_callback("Audio generation completed", 1.0)
+        return cached
     
-    config = netmind_config if api_key is None else NetMindConfig(api_key)
+    if not _TTS_BULKHEAD.acquire(timeout=TTS_BULKHEAD_TIMEOUT):
+        raise TTSError(f"TTS bulkhead full: {TTS_SYNC_BULKHEAD_SIZE} requests already in flight")
+    try:
+        breaker = tts_breaker(config)
+        breaker.before_call()
+        try:
+            audio_content = _request_tts_audio(config, text, progress_callback)
+        except BaseException as e:
+            breaker.record_outcome(e)
+            raise
+        breaker.record_success()
+    finally:
+        _TTS_BULKHEAD.release()
     
+    _tts_cache_put(cache_key, audio_content)
+    return audio_content
+
+def _request_tts_audio(config, text, progress_callback=None):
+    """
+    Synthesize text with one request to the NetMind speech endpoint and download the audio
+    """
     # Use API endpoint from official documentation
     url = "https://api.netmind.ai/inference-api/openai/v1/audio/speech"
     
-    payload = {
-        "model": config.get_tts_model(),
-        "input": text
-    }
+    payload = config.get_tts_payload(text)
     
     headers = {
         'Authorization': f'Bearer {config.api_key}',
-        'Connection': 'keep-alive'
+        'Connection': 'keep-alive',
+        # One key per call, so the session's retries are deduplicated but a later synthesis is not replayed
+        'Idempotency-Key': uuid.uuid4().hex
     }
     
-    # Create session and configure retry strategy
-    session = requests.Session()
-    
-    # Enhanced retry strategy with exponential backoff and jitter
-    retry_strategy = Retry(
-        total=5,  # Increased retry attempts
-        backoff_factor=2,  # Exponential backoff: 2, 4, 8, 16 seconds
-        status_forcelist=[429, 500, 502, 503, 504, 520, 521, 522, 523, 524],
-        allowed_methods=["POST", "GET"],  # Allow retries for POST requests
-        raise_on_status=False,  # Don't raise on HTTP errors, handle manually
-        respect_retry_after_header=True  # Respect server's retry-after header
-    )
+    session = _TTS_SESSION
     
-    # Create adapter with optimized connection pooling
-    adapter = HTTPAdapter(
-        max_retries=retry_strategy,
-        pool_connections=10,  # Connection pool size
-        pool_maxsize=20,     # Max connections in pool
-        pool_block=False     # Don't block when pool is full
-    )
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    
-    # Configure session-level timeouts
-    session.timeout = (30, 300)  # (connect_timeout, read_timeout)
-    
-    # Try multiple times with enhanced retry mechanism
-    max_attempts = 5  # Increased from 3 to 5
+    # The failure is kept as the exception to raise, with its retry hints, rather than parsed back out of a message
+    last_error: Optional[TTSError] = None
     
-    last_error = None
-    import random
-    
-    for attempt in range(1, max_attempts + 1):
-        try:
-            if progress_callback:
-                progress_callback(f"TTS attempt {attempt}/{max_attempts}", (attempt-1) * 0.2)
-            logger.info(f"TTS attempt {attempt}/{max_attempts}")
-            
-            # Add jitter to prevent thundering herd
-            if attempt > 1:
-                jitter = random.uniform(0.5, 1.5)
-                base_delay = min(300, (2 ** (attempt - 2)) * 2)  # Cap at 5 minutes
-                delay = base_delay * jitter
-                logger.info(f"Waiting {delay:.1f}s before retry {attempt}")
-                if progress_callback:
-                    progress_callback(f"Waiting {int(delay)}s before retry...", (attempt-1) * 0.2 + 0.05)
-                time.sleep(delay)
-            
-            # Send request with configured timeouts
-            if progress_callback:
-                progress_callback("Calling TTS API...", attempt * 0.2 + 0.1)
-            logger.info("Sending TTS request to NetMind API")
-            
-            response = session.post(
-                url, 
-                headers=headers, 
-                data=payload, 
-                timeout=(30, 300),  # (connect_timeout, read_timeout)
-                stream=False
-            )
-            
-            if response.status_code == 200:
-                # NetMind API returns JSON format containing download URL
-                try:
-                    import json
-                    response_data = json.loads(response.text)
-                    download_url = response_data.get('result_download_url')
+    try:
+        # Send request with configured timeouts
+        if progress_callback:
+            progress_callback("Calling TTS API...", 0.1)
+        logger.info("Sending TTS request to NetMind API")
+        
+        response = session.post(
+            url, 
+            headers=headers, 
+            json=payload, 
+            timeout=(30, 300),  # (connect_timeout, read_timeout)
+            stream=False
+        )
+        
+        if response.status_code == 200:
+            # NetMind API returns JSON format containing download URL
+            try:
+                response_data = orjson.loads(response.content)
+                download_url = response_data.get('result_download_url')
+                
+                if download_url:
+                    # Download actual audio file with progress tracking
+                    if progress_callback:
+                        progress_callback("Downloading audio file...", 0.5)
+                    logger.info(f"Downloading audio from: {download_url[:50]}...")
                     
-                    if download_url:
-                        # Download actual audio file with progress tracking
+                    # Use longer timeout for file download
+                    audio_response = session.get(
+                        download_url, 
+                        headers=conditional_download_headers(download_url),
+                        timeout=(30, 600),  # 10 minutes for large audio files
+                        stream=True  # Stream download for large files
+                    )
+                    
+                    cached_audio = read_cached_download(download_url) if audio_response.status_code == 304 else None
+                    if cached_audio is not None:
+                        audio_response.close()
                         if progress_callback:
-                            progress_callback("Downloading audio file...", attempt * 0.2 + 0.15)
-                        logger.info(f"Downloading audio from: {download_url[:50]}...")
-                        
-                        # Use longer timeout for file download
-                        audio_response = session.get(
-                            download_url, 
-                            timeout=(30, 600),  # 10 minutes for large audio files
-                            stream=True  # Stream download for large files
-                        )
+                            progress_callback("Audio generation completed", 1.0)
+                        logger.info(f"Audio not modified, using cached download of {len(cached_audio)} bytes")
+                        return cached_audio
+                    elif audio_response.status_code == 200:
+                        # Collect audio content; bytearray grows in place instead of copying on every chunk
+                        total_size = int(audio_response.headers.get('content-length', 0) or 0)
+                        downloaded = 0
                         
-                        if audio_response.status_code == 200:
-                            # Collect audio content
-                            audio_content = b''
-                            total_size = int(audio_response.headers.get('content-length', 0))
-                            downloaded = 0
-                            
-                            for chunk in audio_response.iter_content(chunk_size=8192):
+                        if total_size > 0 and audio_response.headers.get('content-encoding', 'identity') == 'identity':
+                            # Known size and no transfer encoding to undo: read straight into one preallocated buffer
+                            audio_content = bytearray(total_size)
+                            view = memoryview(audio_content)
+                            while downloaded < total_size:
+                                n = audio_response.raw.readinto(view[downloaded:downloaded + 65536])
+                                if not n:
+                                    break
+                                downloaded += n
+                                if progress_callback:
+                                    overall_progress = 0.5 + (downloaded / total_size * 0.45)
+                                    progress_callback(f"Downloaded {downloaded//1024}KB/{total_size//1024}KB", overall_progress)
+                            view.release()
+                            if downloaded < total_size:
+                                # Older urllib3 ends a short read quietly; a truncated clip must never be returned or cached
+                                audio_response.close()
+                                raise TTSConnectionError(
+                                    f"Audio download incomplete: received {downloaded} of {total_size} bytes"
+                                )
+                        else:
+                            audio_content = bytearray()
+                            for chunk in audio_response.iter_content(chunk_size=65536):
                                 if chunk:
-                                    audio_content += chunk
+                                    audio_content.extend(chunk)
                                     downloaded += len(chunk)
                                     
                                     # Update progress during download
                                     if total_size > 0 and progress_callback:
                                         download_progress = downloaded / total_size
-                                        overall_progress = attempt * 0.2 + 0.15 + (download_progress * 0.05)
+                                        overall_progress = 0.5 + (download_progress * 0.45)
                                         progress_callback(f"Downloaded {downloaded//1024}KB/{total_size//1024}KB", overall_progress)
-                            
-                            if progress_callback:
-                                progress_callback("Audio generation completed", 1.0)
-                            logger.info(f"TTS generated successfully, audio size: {len(audio_content)} bytes")
-                            session.close()
-                            return audio_content
-                        else:
-                            last_error = f"Audio download failed: HTTP {audio_response.status_code} - {audio_response.reason}"
-                            logger.warning(f"Attempt {attempt} failed: {last_error}")
-                    else:
-                        last_error = f"Download URL not found in API response: {response.text[:200]}..."
-                        logger.warning(f"Attempt {attempt} failed: {last_error}")
                         
-                except json.JSONDecodeError as e:
-                    last_error = f"API response JSON parsing failed: {str(e)}"
-                    logger.error(f"Attempt {attempt} failed: {last_error}")
+                        if progress_callback:
+                            progress_callback("Audio generation completed", 1.0)
+                        logger.info(f"TTS generated successfully, audio size: {len(audio_content)} bytes")
+                        audio_content = bytes(audio_content)
+                        store_download(download_url, audio_response.headers, audio_content)
+                        return audio_content
+                    else:
+                        # Hand the unread streamed connection back to the shared pool
+                        audio_response.close()
+                        last_error = tts_status_error(
+                            audio_response.status_code,
+                            f"Audio download failed: HTTP {audio_response.status_code} - {audio_response.reason}",
+                            audio_response.headers
+                        )
+                        logger.warning(str(last_error))
+                else:
+                    last_error = TTSError(f"Download URL not found in API response: {response.text[:200]}...")
+                    logger.warning(str(last_error))
+                    
+            except json.JSONDecodeError as e:
+                last_error = TTSError(f"API response JSON parsing failed: {str(e)}")
+                logger.error(str(last_error))
+                if logger.isEnabledFor(logging.DEBUG):
                     logger.debug(f"Raw response: {response.text[:500]}...")
-            else:
-                last_error = f"TTS request failed: HTTP {response.status_code} - {response.reason}"
-                logger.warning(f"Attempt {attempt} failed: {last_error}")
+        else:
+            last_error = tts_status_error(
+                response.status_code,
+                f"TTS request failed: HTTP {response.status_code} - {response.reason}",
+                response.headers
+            )
+            logger.warning(str(last_error))
+            # Only decode the body when debug output is actually wanted
+            if logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Response headers: {dict(response.headers)}")
                 logger.debug(f"Response body: {response.text[:500]}...")
-                
-        except Timeout as e:
-            last_error = f"TTS request timeout (attempt {attempt}): {str(e)}"
-            logger.warning(last_error)
-            if attempt < max_attempts:
-                time.sleep(2)  # Wait before retry
-            else:
-                raise TTSTimeoutError(f"TTS service timeout after {max_attempts} attempts: {str(e)}")
-                
-        except ConnectionError as e:
-            last_error = f"TTS connection failed (attempt {attempt}): {str(e)}"
-            logger.warning(last_error)
-            if attempt < max_attempts:
-                time.sleep(2)  # Wait before retry
-            else:
-                raise TTSConnectionError(f"Unable to connect to TTS service after {max_attempts} attempts: {str(e)}")
-                
-        except RequestException as e:
-            last_error = f"TTS network request failed (attempt {attempt}): {str(e)}"
-            logger.warning(last_error)
+            
+    except Timeout as e:
+        raise TTSTimeoutError(f"TTS service timeout: {str(e)}")
+            
+    except ReqConnectionError as e:
+        raise TTSConnectionError(f"Unable to connect to TTS service: {str(e)}")
+    
+    # Raw reads of the download bypass requests' exception wrapping
+    except ReadTimeoutError as e:
+        raise TTSTimeoutError(f"TTS download timeout: {str(e)}")
+    
+    except ProtocolError as e:
+        raise TTSConnectionError(f"TTS download interrupted: {str(e)}")
+            
+    except RequestException as e:
+        raise TTSError(f"TTS request failed: {str(e)}")
+    
+    # The request completed but did not produce audio
+    raise last_error or TTSError("TTS service unavailable")
+
+class AsyncNetMindClient:
+    """
+    Async NetMind HTTP client sharing one pooled keep-alive connection pool across TTS requests
+    Concurrent segment requests are multiplexed over HTTP/2 where the server supports it
+    """
+    
+    def __init__(self):
+        self.client = httpx.AsyncClient(
+            # Connection-level retries cover dropped keep-alive sockets without re-entering the attempt loop
+            # A custom transport owns the pool, so the limits must be set on it; the client ignores its own
+            transport=httpx.AsyncHTTPTransport(
+                retries=3,
+                http2=True,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=32, keepalive_expiry=60.0)
+            ),
+            timeout=httpx.Timeout(300.0, connect=30.0)
+        )
+    
+    async def create_speech(self, config: NetMindConfig, text: str, sink, progress_callback=None, max_attempts: int = 3) -> int:
+        """
+        Synthesize text and stream the resulting audio file into a writable binary sink
+        
+        Returns the number of bytes written; a failed attempt truncates the sink before retrying
+        Fails fast with TTSAPIError while the TTS circuit breaker is open
+        """
+        breaker = tts_breaker(config)
+        await breaker.before_call_async()
+        try:
+            written = await self._create_speech(config, text, sink, progress_callback, max_attempts)
+        except BaseException as e:
+            # Cancellation and rejected requests say nothing about the service, but still release a half-open probe
+            breaker.record_outcome(e)
+            raise
+        breaker.record_success()
+        return written
+    
+    async def _create_speech(self, config: NetMindConfig, text: str, sink, progress_callback=None, max_attempts: int = 3) -> int:
+        start = sink.tell()
+        payload = config.get_tts_payload(text)
+        # Shared by this call's attempts only, so a later synthesis of the same text is not answered with a stale replay
+        idempotency_key = uuid.uuid4().hex
+        
+        last_error = None
+        for attempt in range(1, max_attempts + 1):
+            try:
+                # The slot is held for one attempt, not during the backoff between attempts
+                async with netmind_slot():
+                    download_url = await self._post_tts(config, payload, idempotency_key)
+                    if progress_callback:
+                        progress_callback("Downloading audio file...", 0.0)
+                    return await self._get_audio(download_url, sink, start, progress_callback)
+            except TTSError as e:
+                if not e.retryable:
+                    raise
+                last_error = e
+            except httpx.TimeoutException as e:
+                last_error = TTSTimeoutError(f"TTS request timeout (attempt {attempt}): {str(e)}")
+            except httpx.NetworkError as e:
+                last_error = TTSConnectionError(f"TTS connection failed (attempt {attempt}): {str(e)}")
+            except (httpx.HTTPError, ValueError) as e:
+                last_error = TTSError(f"TTS request failed (attempt {attempt}): {str(e)}")
+            
             if attempt < max_attempts:
-                time.sleep(1)  # Wait before retry
+                # A server-requested delay wins over our own backoff
+                delay = last_error.retry_after
+                await asyncio.sleep(delay if delay is not None else full_jitter_delay(attempt))
+        
+        raise last_error
+    
+    async def _post_tts(self, config: NetMindConfig, payload: Dict[str, Any], idempotency_key: str) -> str:
+        """
+        Request synthesis and return the URL the audio can be downloaded from
+        """
+        response = await self.client.post(
+            f"{config.base_url}/audio/speech",
+            headers={'Authorization': f'Bearer {config.api_key}', 'Idempotency-Key': idempotency_key},
+            json=payload
+        )
+        if response.status_code != 200:
+            raise tts_status_error(
+                response.status_code,
+                f"TTS request failed: HTTP {response.status_code} - {response.reason_phrase}",
+                response.headers
+            )
+        download_url = orjson.loads(response.content).get('result_download_url')
+        if not download_url:
+            raise TTSAPIError(f"Download URL not found in API response: {response.text[:200]}...")
+        return download_url
+    
+    async def _get_audio(self, download_url: str, sink, start: int, progress_callback=None) -> int:
+        """
+        Stream the synthesized audio into sink from offset start, returning the number of bytes written
+        """
+        async with self.client.stream(
+            "GET",
+            download_url,
+            headers=conditional_download_headers(download_url),
+            timeout=httpx.Timeout(600.0, connect=30.0)
+        ) as audio_response:
+            cached_audio = open_cached_download(download_url) if audio_response.status_code == 304 else None
+            if cached_audio is not None:
+                sink.seek(start)
+                sink.truncate()
+                with cached_audio:
+                    shutil.copyfileobj(cached_audio, sink)
+                return sink.tell() - start
+            if audio_response.status_code != 200:
+                raise tts_status_error(
+                    audio_response.status_code,
+                    f"Audio download failed: HTTP {audio_response.status_code} - {audio_response.reason_phrase}",
+                    audio_response.headers
+                )
+            sink.seek(start)
+            sink.truncate()
+            downloaded = 0
+            total_size = int(audio_response.headers.get('content-length', 0))
+            async for chunk in audio_response.aiter_bytes(64 * 1024):
+                sink.write(chunk)
+                downloaded += len(chunk)
+                if progress_callback:
+                    if total_size > 0:
+                        progress_callback(f"Downloaded {downloaded//1024}KB/{total_size//1024}KB", downloaded / total_size)
+                    else:
+                        # Without a content-length only the amount received so far is known
+                        progress_callback(f"Downloaded {downloaded//1024}KB", 0.0)
+            if TTS_CONDITIONAL_GET:
+                # Copied file to file, so a sink that streams to disk never holds the clip in memory
+                sink.seek(start)
+                await asyncio.get_running_loop().run_in_executor(
+                    _TTS_EXECUTOR, store_download, download_url, audio_response.headers, sink
+                )
+            return downloaded
+    
+    async def aclose(self):
+        await self.client.aclose()
+
+
+# One client per event loop, since pooled connections cannot be shared across loops
+_async_clients = weakref.WeakKeyDictionary()
+
+def get_async_netmind_client() -> AsyncNetMindClient:
+    """
+    Get the AsyncNetMindClient bound to the running event loop
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncNetMindClient()
+    return client
+
+async def create_tts_audio_async(text, api_key=None, progress_callback=None, sink=None):
+    """
+    Create TTS audio using NetMind API without blocking the event loop
+    
+    Args:
+        text (str): Text to convert to speech
+        api_key (str, optional): NetMind API key
+        progress_callback (callable, optional): Optional callback for download progress
+        sink (file, optional): Writable, seekable binary file to stream the audio into instead of memory
+    
+    Returns:
+        bytes: Audio content in MP3 format, or the number of bytes written when a sink is given
+    
+    Raises:
+        TTSConnectionError, TTSTimeoutError, TTSAPIError, TTSQuotaError, TTSError
+    """
+    config = netmind_config if api_key is None else NetMindConfig(api_key)
+    if sink is not None:
+        return await get_async_netmind_client().create_speech(config, text, sink, progress_callback)
+    cache_key = tts_cache_key(config, text)
+    cached = _tts_memory_cache_get(cache_key)
+    # The disk layer does blocking file I/O and occasionally scans the whole cache, so it runs off the loop
+    loop = asyncio.get_running_loop()
+    if cached is None:
+        cached = await loop.run_in_executor(_TTS_EXECUTOR, _tts_disk_cache_get, cache_key)
+    if cached is not None:
+        return cached
+    buffer = io.BytesIO()
+    await get_async_netmind_client().create_speech(config, text, buffer, progress_callback)
+    audio = buffer.getvalue()
+    _tts_memory_cache_put(cache_key, audio)
+    await loop.run_in_executor(_TTS_EXECUTOR, _tts_disk_cache_put, cache_key, audio)
+    return audio
+
+def create_tts_audio_sync(text, api_key=None, progress_callback=None):
+    """
+    Blocking wrapper around create_tts_audio_async for callers without a running event loop
+    """
+    async def _run():
+        try:
+            return await create_tts_audio_async(text, api_key, progress_callback)
+        finally:
+            # The loop is discarded after this call, so its pooled client must not outlive it
+            client = _async_clients.pop(asyncio.get_running_loop(), None)
+            if client is not None:
+                await client.aclose()
+    
+    return asyncio.run(_run())
+
+# Dedicated threads for blocking TTS calls made from async code, sized to the bulkhead and connection pool
+# so they do not starve the loop's default executor
+_TTS_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=TTS_SYNC_BULKHEAD_SIZE, thread_name_prefix='netmind-tts')
+
+async def create_tts_audio_asyncified(text, api_key=None, progress_callback=None):
+    """
+    Run the blocking create_tts_audio on the TTS thread pool
+    Prefer create_tts_audio_async where possible, it needs no thread per request
+    """
+    return await asyncio.get_running_loop().run_in_executor(
+        _TTS_EXECUTOR, functools.partial(create_tts_audio, text, api_key, progress_callback)
+    )
+
+# Short requests let the service synthesize a tour in parallel; chunks never span paragraphs,
+# so the pauses between paragraphs stay where the text puts them
+TTS_CHUNK_CHARS = 300
+TTS_SEGMENT_CONCURRENCY = 8
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
+def split_tts_text(text, max_chars=TTS_CHUNK_CHARS):
+    """
+    Split tour text into chunks of whole sentences, up to about max_chars, that can be synthesized independently
+    A single sentence longer than max_chars becomes its own chunk
+    """
+    chunks = []
+    for paragraph in text.split("\n\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        current = ""
+        for sentence in _SENTENCE_BOUNDARY.split(paragraph):
+            if current and len(current) + 1 + len(sentence) > max_chars:
+                chunks.append(current)
+                current = sentence
             else:
-                raise TTSError(f"TTS request failed after {max_attempts} attempts: {str(e)}")
-    
-    # All attempts failed
-    session.close()
-    
-    # Determine appropriate exception type based on last error
-    if "timeout" in str(last_error).lower():
-        raise TTSTimeoutError(last_error or "TTS service timeout after multiple attempts")
-    elif "connection" in str(last_error).lower():
-        raise TTSConnectionError(last_error or "TTS connection failed after multiple attempts")
-    elif "quota" in str(last_error).lower() or "429" in str(last_error):
-        raise TTSQuotaError(last_error or "TTS API quota exceeded")
-    elif any(code in str(last_error) for code in ["400", "401", "403", "404", "500", "502", "503"]):
-        raise TTSAPIError(last_error or "TTS API error after multiple attempts")
-    else:
-        raise TTSError(last_error or "TTS service unavailable after multiple attempts")
\ No newline at end of file
+                current = f"{current} {sentence}" if current else sentence
+        chunks.append(current)
+    return chunks
+
+async def create_tts_audio_stream(sections, api_key=None, progress_callback=None, max_concurrency=TTS_SEGMENT_CONCURRENCY, output_path=None):
+    """
+    Create TTS audio from an async iterable of text sections, starting synthesis of each section as soon as it arrives
+    Sections are split into sentence chunks that are synthesized concurrently and joined into one MP3 file
+    Segments are streamed to disk as they download, so memory use stays flat regardless of tour length
+    
+    Args:
+        sections (AsyncIterable[str]): Text sections in playback order, e.g. streamed from the tour orchestrator
+        api_key (str, optional): NetMind API key
+        progress_callback (callable, optional): Called after each completed segment
+        max_concurrency (int): Maximum number of TTS requests in flight
+        output_path (str, optional): Destination MP3 file, a new temporary file by default
+    
+    Returns:
+        str: Path of the MP3 file, segments in original text order
+    
+    Raises:
+        TTSError: Any TTS failure raised by create_speech for a segment, after all sections were consumed
+    """
+    config = netmind_config if api_key is None else NetMindConfig(api_key)
+    client = get_async_netmind_client()
+    semaphore = asyncio.Semaphore(max_concurrency)
+    tasks = []
+    completed = 0
+    
+    async def _tts_one(chunk):
+        nonlocal completed
+        segment_file = tempfile.TemporaryFile()
+        try:
+            async with semaphore:
+                await client.create_speech(config, chunk, segment_file)
+        except BaseException:
+            segment_file.close()
+            raise
+        completed += 1
+        if progress_callback:
+            progress_callback(f"Synthesized segment {completed}/{len(tasks)}", completed / len(tasks))
+        return segment_file
+    
+    try:
+        # Consume every section even if a segment already failed, so the caller always receives the full text
+        async for section in sections:
+            for chunk in split_tts_text(section) or [section]:
+                tasks.append(asyncio.create_task(_tts_one(chunk)))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        segments = await asyncio.gather(*tasks, return_exceptions=True)
+        for segment in segments:
+            if not isinstance(segment, BaseException):
+                segment.close()
+        raise
+    
+    # gather preserves scheduling order; MP3 frames from the same codec concatenate cleanly
+    segments = await asyncio.gather(*tasks, return_exceptions=True)
+    try:
+        for segment in segments:
+            if isinstance(segment, BaseException):
+                raise segment
+        
+        # Write next to the destination and rename, so a partially written file is never visible;
+        # the .part suffix also keeps cache curation from deleting it while it is being written
+        output_dir = os.path.dirname(output_path) if output_path else None
+        with tempfile.NamedTemporaryFile(suffix=".mp3" + CACHE_PARTIAL_SUFFIX if output_path else ".mp3", dir=output_dir, delete=False) as output_file:
+            for segment in segments:
+                segment.seek(0)
+                shutil.copyfileobj(segment, output_file)
+        if output_path:
+            os.replace(output_file.name, output_path)
+        else:
+            output_path = output_file.name
+    finally:
+        for segment in segments:
+            if not isinstance(segment, BaseException):
+                segment.close()
+    
+    if progress_callback:
+        progress_callback("Audio generation completed", 1.0)
+    return output_path
+
+async def create_tts_audio_parallel(text, api_key=None, progress_callback=None, max_concurrency=TTS_SEGMENT_CONCURRENCY, output_path=None):
+    """
+    Create TTS audio by synthesizing sentence chunks concurrently and joining the MP3 segments
+    
+    Args:
+        text (str): Text to convert to speech
+        api_key (str, optional): NetMind API key
+        progress_callback (callable, optional): Called after each completed segment
+        max_concurrency (int): Maximum number of TTS requests in flight
+        output_path (str, optional): Destination MP3 file, a new temporary file by default
+    
+    Returns:
+        str: Path of the MP3 file, segments in original text order
+    
+    Raises:
+        TTSError: Any TTS failure raised by create_speech for a segment
+    """
+    async def _single_section():
+        yield text
+    
+    return await create_tts_audio_stream(_single_section(), api_key, progress_callback, max_concurrency, output_path)
+
+def create_tts_audio_segmented(text, api_key=None, progress_callback=None, max_chars=400, max_concurrent=4):
+    """
+    Create TTS audio from synchronous code by synthesizing sentence chunks on a thread pool and joining the MP3 segments
+    
+    Args:
+        text (str): Text to convert to speech
+        api_key (str, optional): NetMind API key
+        progress_callback (callable, optional): Called as each segment, in order, is ready
+        max_chars (int): Approximate maximum characters per chunk
+        max_concurrent (int): Maximum number of TTS requests in flight
+    
+    Returns:
+        bytes: Audio content in MP3 format, segments in original text order
+    
+    Raises:
+        TTSError: The first TTS failure raised by create_tts_audio for a segment
+    """
+    chunks = split_tts_text(text, max_chars) or [text]
+    segments = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+        # map yields results in submission order, so segments stay in text order
+        for segment in executor.map(lambda chunk: create_tts_audio(chunk, api_key), chunks):
+            segments.append(segment)
+            if progress_callback:
+                progress_callback(f"Synthesized segment {len(segments)}/{len(chunks)}", len(segments) / len(chunks))
+    # MP3 frames from the same codec concatenate cleanly
+    return b"".join(segments)
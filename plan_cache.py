@@ -0,0 +1,65 @@
+import re
+from collections import OrderedDict
+from typing import Any, Optional
+
+# Plans are shared between tours of the same city, interests and duration bucket
+PLAN_CACHE_MAX_ENTRIES = 256
+DURATION_BUCKET_MINUTES = 15
+
+# Words that describe the kind of tour rather than where it goes
+_TOUR_WORDS = {"a", "an", "the", "of", "in", "around", "through", "tour", "walking", "audio", "guided", "trip", "visit"}
+
+_plans: "OrderedDict[tuple, Any]" = OrderedDict()
+
+
+def city_keyword(query: str) -> str:
+    """
+    Reduce a tour query to its place name, e.g. "Walking tour of Rome, Italy" -> "rome"
+    """
+    place = query.split(",", 1)[0].lower()
+    return " ".join(word for word in re.findall(r"\w+", place) if word not in _TOUR_WORDS)
+
+
+def duration_bucket(duration: float) -> int:
+    """
+    Round a duration in minutes to the nearest bucket, never below one bucket
+    """
+    return max(1, round(duration / DURATION_BUCKET_MINUTES)) * DURATION_BUCKET_MINUTES
+
+
+def plan_key(query: str, interests, duration: float) -> tuple:
+    return city_keyword(query), tuple(sorted(interests)), duration_bucket(duration)
+
+
+def lookup(query: str, interests, duration: float) -> Optional[Any]:
+    """
+    Get the plan stored for a similar tour, or None
+    """
+    key = plan_key(query, interests, duration)
+    plan = _plans.get(key)
+    if plan is not None:
+        _plans.move_to_end(key)
+    return plan
+
+
+def store(query: str, interests, duration: float, plan: Any) -> None:
+    """
+    Remember a completed plan as the template for similar tours
+    """
+    key = plan_key(query, interests, duration)
+    _plans[key] = plan
+    _plans.move_to_end(key)
+    while len(_plans) > PLAN_CACHE_MAX_ENTRIES:
+        _plans.popitem(last=False)
+
+
+def adapt_plan(plan: Any, duration: float) -> Any:
+    """
+    Rescale a cached plan's minute allocations to an exact tour duration
+    """
+    minutes = plan.model_dump()
+    total = sum(minutes.values())
+    if not total:
+        return plan
+    scale = duration / total
+    return plan.model_copy(update={section: value * scale for section, value in minutes.items()})
@@ -24,12 +24,18 @@ class Printer:
         self.hide_done_ids.add(item_id)
 
     def update_item(
-        self, item_id: str, content: str, is_done: bool = False, hide_checkmark: bool = False
+        self,
+        item_id: str,
+        content: str,
+        is_done: bool = False,
+        hide_checkmark: bool = False,
+        flush: bool = True,
     ) -> None:
         self.items[item_id] = (content, is_done)
         if hide_checkmark:
             self.hide_done_ids.add(item_id)
-        self.flush()
+        if flush:
+            self.flush()
 
     def mark_item_done(self, item_id: str) -> None:
         self.items[item_id] = (self.items[item_id][0], True)
@@ -0,0 +1,59 @@
+import pytest
+
+import netmind_config
+from netmind_config import TTSAPIError, create_tts_audio, tts_breaker
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.reason = "Fake"
+        self.headers = headers or {}
+        self.text = ""
+        self.content = b""
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def tts_post(monkeypatch):
+    """
+    Answer every sync TTS POST with the given response, bypassing the clip caches
+    """
+    monkeypatch.setattr(netmind_config, "_tts_cache_get", lambda key: None)
+
+    def _answer(response):
+        monkeypatch.setattr(netmind_config._TTS_SESSION, "post", lambda *args, **kwargs: response)
+
+    return _answer
+
+
+def test_rejected_requests_do_not_open_breaker(tts_post):
+    api_key = "rejected-key"
+    tts_post(FakeResponse(401))
+    breaker = tts_breaker(netmind_config.NetMindConfig(api_key))
+
+    for _ in range(breaker.failure_threshold + 1):
+        with pytest.raises(TTSAPIError) as excinfo:
+            create_tts_audio("Hello", api_key=api_key)
+        assert not excinfo.value.retryable
+        assert "circuit" not in str(excinfo.value)
+
+    assert breaker.state == breaker.CLOSED
+
+
+def test_server_errors_open_breaker(tts_post):
+    api_key = "outage-key"
+    tts_post(FakeResponse(503, {"Retry-After": "2"}))
+    breaker = tts_breaker(netmind_config.NetMindConfig(api_key))
+
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(TTSAPIError) as excinfo:
+            create_tts_audio("Hello", api_key=api_key)
+        assert excinfo.value.retryable
+        assert excinfo.value.retry_after == 2.0
+
+    assert breaker.state == breaker.OPEN
+    with pytest.raises(TTSAPIError, match="circuit open"):
+        create_tts_audio("Hello", api_key=api_key)